@@ -1,11 +1,23 @@
 import streamlit as st
-import streamlit.components.v1 as components
-import random
 import json
-import pandas as pd
 from datetime import datetime
 import base64
+import uuid
+from urllib.parse import urlencode
 from math import floor, ceil
+from itertools import islice
+
+import history_export
+import roster_import
+import spin_engine
+from config_import import SETTING_CHOICES, SETTING_RANGES, ConfigImportError, import_configuration
+from analytics import RecencyWeights, ResultsAggregator, history_frame
+from ledger import open_ledger
+from roster import Roster, parse_entry
+from assets import load_fonts, load_stylesheet, vendor_urls
+from static_pages import render_header, render_static_sections
+from fragments import begin_page, end_page, request_full_rerun, timed_fragment, timing_report
+from wheel_component import premium_wheel
 
 # Configure page
 st.set_page_config(
@@ -19,16 +31,18 @@ st.set_page_config(
 def initialize_session_state():
     """Initialize all session state variables"""
     defaults = {
-        "names": ["Alice", "Bob", "Charlie", "Diana", "Ethan", "Fatima", "George", "Hannah"],
-        "results": [],
-        "spin_counter": 0,
+        "names": Roster(["Alice", "Bob", "Charlie", "Diana", "Ethan", "Fatima", "George", "Hannah"]),
         "wheel_settings": {
             "spin_duration": 4,
             "spin_count": 8,
             "allow_duplicates": True,
             "remove_winner": False,
+            "selection_mode": "random",
+            "recency_basis": "spins",
+            "recency_half_life": 5,
             "sound_enabled": True,
             "animation_style": "smooth",
+            "render_mode": "bitmap",
             "wheel_theme": "executive"
         },
         "color_scheme": "executive",
@@ -45,6 +59,9 @@ def initialize_session_state():
         },
         "magic_mode": False,
         "predetermined_winners": {},
+        "pending_spin": None,
+        "replay_spin": None,
+        "multi_draw_count": 0,
         "magic_unlocked": False,
         "premium_features": True,
         "user_tier": "Professional"
@@ -53,589 +70,38 @@ def initialize_session_state():
     for key, value in defaults.items():
         if key not in st.session_state:
             st.session_state[key] = value
+    
+    # The spin history lives in the ledger under an id kept in the page URL,
+    # so reopening the link (or a restarted worker) picks it back up
+    if "history_id" not in st.session_state:
+        st.session_state.history_id = st.query_params.get("history") or uuid.uuid4().hex
+        st.query_params["history"] = st.session_state.history_id
+    
+    # Running tallies over the history, kept in step with every append
+    if "results_stats" not in st.session_state:
+        st.session_state.results_stats = ResultsAggregator.from_counts(
+            **open_ledger().tallies(st.session_state.history_id)
+        )
+
+def history_results():
+    """Every spin in this session's history, oldest first, streamed from the ledger"""
+    return open_ledger().results(st.session_state.history_id)
+
+def set_results(results):
+    """Replace the spin history and rebuild its running tallies"""
+    open_ledger().replace(st.session_state.history_id, results)
+    st.session_state.results_stats = ResultsAggregator(results)
+    st.session_state.pop("recency_weights", None)
+    st.session_state.history_cursors = []
 
 initialize_session_state()
+begin_page()
 
 # Premium CSS with sophisticated design
 def load_premium_css():
     """Load premium, sophisticated CSS styling"""
-    st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700;800;900&family=Playfair+Display:wght@400;500;600;700;800;900&family=JetBrains+Mono:wght@400;500;600&display=swap');
-
-    :root {
-        --primary: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        --primary-solid: #667eea;
-        --secondary: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
-        --accent: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
-        --success: linear-gradient(135deg, #43e97b 0%, #38f9d7 100%);
-        --warning: linear-gradient(135deg, #fa709a 0%, #fee140 100%);
-        --premium: linear-gradient(135deg, #ffecd2 0%, #fcb69f 100%);
-        --executive: linear-gradient(135deg, #0c0c0c 0%, #1a1a1a 100%);
-        
-        --bg-primary: #0a0b0f;
-        --bg-secondary: #1a1d29;
-        --bg-tertiary: #2a2f42;
-        --surface: rgba(255, 255, 255, 0.02);
-        --surface-elevated: rgba(255, 255, 255, 0.05);
-        --surface-premium: rgba(255, 255, 255, 0.08);
-        
-        --text-primary: #ffffff;
-        --text-secondary: #a0a6b8;
-        --text-muted: #6b7280;
-        --text-accent: #667eea;
-        
-        --border: rgba(255, 255, 255, 0.1);
-        --border-accent: rgba(102, 126, 234, 0.3);
-        
-        --shadow-sm: 0 2px 4px rgba(0, 0, 0, 0.1);
-        --shadow-md: 0 4px 12px rgba(0, 0, 0, 0.15);
-        --shadow-lg: 0 8px 32px rgba(0, 0, 0, 0.25);
-        --shadow-xl: 0 20px 60px rgba(0, 0, 0, 0.4);
-        --shadow-premium: 0 25px 80px rgba(102, 126, 234, 0.3);
-        
-        --radius: 16px;
-        --radius-lg: 24px;
-        --radius-xl: 32px;
-    }
-
-    html, body, .stApp {
-        font-family: 'Inter', sans-serif;
-        background: var(--bg-primary);
-        color: var(--text-primary);
-        overflow-x: hidden;
-    }
-
-    .main .block-container {
-        padding-top: 1rem;
-        max-width: 1600px;
-        padding-left: 2rem;
-        padding-right: 2rem;
-    }
-
-    /* Hide Streamlit elements */
-    #MainMenu, footer, header {visibility: hidden;}
-    .stDeployButton {display: none;}
-
-    /* Premium Header with animated background */
-    .premium-header {
-        position: relative;
-        background: var(--bg-secondary);
-        border: 1px solid var(--border);
-        border-radius: var(--radius-xl);
-        padding: 4rem 3rem;
-        margin-bottom: 3rem;
-        text-align: center;
-        box-shadow: var(--shadow-premium);
-        overflow: hidden;
-        backdrop-filter: blur(20px);
-    }
-
-    .premium-header::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background: var(--primary);
-        opacity: 0.03;
-        z-index: 1;
-        animation: shimmer 8s ease-in-out infinite;
-    }
-
-    .premium-header > * {
-        position: relative;
-        z-index: 2;
-    }
-
-    @keyframes shimmer {
-        0%, 100% { transform: translateX(-100%); }
-        50% { transform: translateX(100%); }
-    }
-
-    .brand-title {
-        font-family: 'Playfair Display', serif;
-        font-size: 4rem;
-        font-weight: 800;
-        background: var(--primary);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        margin: 0 0 1rem 0;
-        text-shadow: 0 4px 20px rgba(102, 126, 234, 0.3);
-        line-height: 1.1;
-    }
-
-    .brand-subtitle {
-        font-size: 1.4rem;
-        color: var(--text-secondary);
-        margin: 0 0 1.5rem 0;
-        font-weight: 400;
-    }
-
-    .trust-indicators {
-        display: flex;
-        justify-content: center;
-        gap: 3rem;
-        margin-top: 2rem;
-        flex-wrap: wrap;
-    }
-
-    .trust-badge {
-        display: flex;
-        align-items: center;
-        gap: 0.75rem;
-        background: var(--surface-elevated);
-        padding: 0.75rem 1.5rem;
-        border-radius: var(--radius);
-        border: 1px solid var(--border);
-        color: var(--text-secondary);
-        font-size: 0.9rem;
-        font-weight: 500;
-        backdrop-filter: blur(10px);
-        transition: all 0.3s ease;
-    }
-
-    .trust-badge:hover {
-        background: var(--surface-premium);
-        border-color: var(--border-accent);
-        transform: translateY(-2px);
-    }
-
-    .trust-badge .icon {
-        font-size: 1.2rem;
-        background: var(--primary);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }
-
-    /* Premium Cards */
-    .premium-card {
-        background: var(--surface-elevated);
-        border: 1px solid var(--border);
-        border-radius: var(--radius-lg);
-        padding: 2rem;
-        margin-bottom: 2rem;
-        box-shadow: var(--shadow-lg);
-        transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-        backdrop-filter: blur(20px);
-        position: relative;
-        overflow: hidden;
-    }
-
-    .premium-card::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 3px;
-        background: var(--primary);
-        opacity: 0;
-        transition: opacity 0.3s ease;
-    }
-
-    .premium-card:hover {
-        background: var(--surface-premium);
-        border-color: var(--border-accent);
-        transform: translateY(-4px);
-        box-shadow: var(--shadow-xl);
-    }
-
-    .premium-card:hover::before {
-        opacity: 1;
-    }
-
-    .card-header {
-        display: flex;
-        align-items: center;
-        gap: 1rem;
-        margin-bottom: 2rem;
-        padding-bottom: 1.5rem;
-        border-bottom: 1px solid var(--border);
-    }
-
-    .card-icon {
-        font-size: 2rem;
-        background: var(--primary);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        filter: drop-shadow(0 2px 8px rgba(102, 126, 234, 0.3));
-    }
-
-    .card-title {
-        font-family: 'Playfair Display', serif;
-        font-size: 1.75rem;
-        font-weight: 600;
-        margin: 0;
-        color: var(--text-primary);
-    }
-
-    /* Premium Buttons */
-    .stButton > button {
-        background: var(--primary);
-        color: white;
-        border: none;
-        padding: 1rem 2rem;
-        border-radius: var(--radius);
-        font-weight: 600;
-        font-size: 1rem;
-        transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
-        box-shadow: var(--shadow-md);
-        font-family: inherit;
-        position: relative;
-        overflow: hidden;
-        min-height: 3rem;
-    }
-
-    .stButton > button::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: -100%;
-        width: 100%;
-        height: 100%;
-        background: linear-gradient(90deg, transparent, rgba(255,255,255,0.2), transparent);
-        transition: left 0.5s;
-    }
-
-    .stButton > button:hover {
-        transform: translateY(-2px) scale(1.02);
-        box-shadow: var(--shadow-lg);
-        filter: brightness(1.1);
-    }
-
-    .stButton > button:hover::before {
-        left: 100%;
-    }
-
-    /* Premium Metrics */
-    .metric-grid {
-        display: grid;
-        grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-        gap: 1.5rem;
-        margin: 2rem 0;
-    }
-
-    .premium-metric {
-        background: var(--surface-elevated);
-        padding: 2rem 1.5rem;
-        border-radius: var(--radius-lg);
-        text-align: center;
-        border: 1px solid var(--border);
-        transition: all 0.3s ease;
-        position: relative;
-        overflow: hidden;
-    }
-
-    .premium-metric::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        height: 2px;
-        background: var(--accent);
-        transform: scaleX(0);
-        transition: transform 0.3s ease;
-    }
-
-    .premium-metric:hover {
-        transform: translateY(-4px);
-        background: var(--surface-premium);
-        box-shadow: var(--shadow-lg);
-    }
-
-    .premium-metric:hover::before {
-        transform: scaleX(1);
-    }
-
-    .metric-value {
-        font-family: 'Playfair Display', serif;
-        font-size: 2.5rem;
-        font-weight: 700;
-        background: var(--primary);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        margin-bottom: 0.5rem;
-        line-height: 1;
-    }
-
-    .metric-label {
-        color: var(--text-secondary);
-        font-weight: 500;
-        text-transform: uppercase;
-        letter-spacing: 0.1em;
-        font-size: 0.8rem;
-    }
-
-    /* Magic Mode Enhancement */
-    .magic-mode-panel {
-        background: linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #0f3460 100%);
-        border: 2px solid #4f46e5;
-        border-radius: var(--radius-lg);
-        padding: 2rem;
-        margin: 2rem 0;
-        box-shadow: 0 0 40px rgba(79, 70, 229, 0.3);
-        position: relative;
-        overflow: hidden;
-    }
-
-    .magic-mode-panel::before {
-        content: '';
-        position: absolute;
-        top: -50%;
-        left: -50%;
-        width: 200%;
-        height: 200%;
-        background: conic-gradient(from 0deg, transparent, #4f46e5, transparent);
-        animation: magical-rotate 4s linear infinite;
-        z-index: 1;
-    }
-
-    .magic-mode-panel::after {
-        content: '';
-        position: absolute;
-        inset: 2px;
-        background: linear-gradient(135deg, #1a1a2e 0%, #16213e 50%, #0f3460 100%);
-        border-radius: calc(var(--radius-lg) - 2px);
-        z-index: 2;
-    }
-
-    .magic-mode-panel > * {
-        position: relative;
-        z-index: 3;
-    }
-
-    @keyframes magical-rotate {
-        0% { transform: rotate(0deg); }
-        100% { transform: rotate(360deg); }
-    }
-
-    .magic-title {
-        font-family: 'Playfair Display', serif;
-        font-size: 1.5rem;
-        font-weight: 700;
-        color: #a78bfa;
-        text-align: center;
-        margin-bottom: 1.5rem;
-        text-shadow: 0 0 20px rgba(167, 139, 250, 0.5);
-    }
-
-    .magic-controls {
-        display: grid;
-        gap: 1.5rem;
-        background: rgba(79, 70, 229, 0.1);
-        padding: 1.5rem;
-        border-radius: var(--radius);
-        border: 1px solid rgba(79, 70, 229, 0.3);
-    }
-
-    /* Spin History Enhancement */
-    .result-item {
-        background: var(--surface-elevated);
-        padding: 1rem 1.5rem;
-        border-radius: var(--radius);
-        margin-bottom: 0.75rem;
-        border: 1px solid var(--border);
-        display: flex;
-        align-items: center;
-        justify-content: space-between;
-        transition: all 0.3s ease;
-    }
-
-    .result-item:hover {
-        background: var(--surface-premium);
-        border-color: var(--border-accent);
-        transform: translateX(4px);
-    }
-
-    .result-item.magic {
-        border-color: #4f46e5;
-        background: linear-gradient(90deg, rgba(79, 70, 229, 0.1) 0%, var(--surface-elevated) 100%);
-    }
-
-    .result-winner {
-        font-weight: 600;
-        color: var(--text-primary);
-    }
-
-    .result-magic {
-        color: #a78bfa;
-        font-size: 0.9rem;
-    }
-
-    /* Sidebar Enhancement */
-    .css-1d391kg {
-        background: var(--bg-secondary);
-        border-right: 1px solid var(--border);
-    }
-
-    .css-1d391kg .css-17lntkn {
-        background: var(--surface-elevated);
-        border-radius: var(--radius);
-        border: 1px solid var(--border);
-        padding: 1.5rem;
-        margin-bottom: 1.5rem;
-    }
-
-    /* Global Statistics */
-    .global-stats {
-        background: var(--bg-secondary);
-        border: 1px solid var(--border);
-        border-radius: var(--radius-lg);
-        padding: 3rem 2rem;
-        margin: 3rem 0;
-        text-align: center;
-        position: relative;
-        overflow: hidden;
-    }
-
-    .global-stats::before {
-        content: '';
-        position: absolute;
-        top: 0;
-        left: 0;
-        right: 0;
-        bottom: 0;
-        background: var(--accent);
-        opacity: 0.02;
-        z-index: 1;
-    }
-
-    .global-stats > * {
-        position: relative;
-        z-index: 2;
-    }
-
-    .global-stats-title {
-        font-family: 'Playfair Display', serif;
-        font-size: 2rem;
-        font-weight: 600;
-        margin-bottom: 2rem;
-        background: var(--accent);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-    }
-
-    /* Premium Footer */
-    .premium-footer {
-        background: var(--bg-secondary);
-        border: 1px solid var(--border);
-        border-radius: var(--radius-lg);
-        padding: 3rem 2rem;
-        margin-top: 4rem;
-        text-align: center;
-        backdrop-filter: blur(20px);
-    }
-
-    .footer-brand {
-        font-family: 'Playfair Display', serif;
-        font-size: 1.8rem;
-        font-weight: 700;
-        background: var(--primary);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        background-clip: text;
-        margin-bottom: 1rem;
-    }
-
-    .footer-links {
-        display: flex;
-        justify-content: center;
-        gap: 3rem;
-        margin: 2rem 0;
-        flex-wrap: wrap;
-    }
-
-    .footer-links a {
-        color: var(--text-secondary);
-        text-decoration: none;
-        font-weight: 500;
-        transition: all 0.3s ease;
-        position: relative;
-    }
-
-    .footer-links a::after {
-        content: '';
-        position: absolute;
-        bottom: -4px;
-        left: 0;
-        width: 0;
-        height: 2px;
-        background: var(--primary);
-        transition: width 0.3s ease;
-    }
-
-    .footer-links a:hover {
-        color: var(--text-primary);
-    }
-
-    .footer-links a:hover::after {
-        width: 100%;
-    }
-
-    .footer-certifications {
-        display: flex;
-        justify-content: center;
-        gap: 2rem;
-        margin: 2rem 0 1rem 0;
-        flex-wrap: wrap;
-    }
-
-    .certification-badge {
-        background: var(--surface-elevated);
-        padding: 0.5rem 1rem;
-        border-radius: var(--radius);
-        border: 1px solid var(--border);
-        font-size: 0.8rem;
-        color: var(--text-secondary);
-        display: flex;
-        align-items: center;
-        gap: 0.5rem;
-    }
-
-    /* Responsive Design */
-    @media (max-width: 768px) {
-        .brand-title { font-size: 2.5rem; }
-        .premium-header { padding: 2rem 1.5rem; }
-        .trust-indicators { gap: 1rem; }
-        .metric-grid { grid-template-columns: repeat(2, 1fr); }
-        .footer-links { gap: 1.5rem; }
-        .main .block-container { padding-left: 1rem; padding-right: 1rem; }
-    }
-
-    /* Custom animations */
-    @keyframes pulse-glow {
-        0%, 100% { 
-            box-shadow: 0 0 20px rgba(102, 126, 234, 0.3);
-        }
-        50% { 
-            box-shadow: 0 0 40px rgba(102, 126, 234, 0.6);
-        }
-    }
-
-    .pulse-glow {
-        animation: pulse-glow 2s infinite;
-    }
-
-    @keyframes gradient-shift {
-        0% { background-position: 0% 50%; }
-        50% { background-position: 100% 50%; }
-        100% { background-position: 0% 50%; }
-    }
-
-    .gradient-animate {
-        background-size: 200% 200%;
-        animation: gradient-shift 3s ease infinite;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    load_fonts()
+    load_stylesheet("premium")
 
 load_premium_css()
 
@@ -652,35 +118,419 @@ def get_premium_color_scheme(scheme_name):
     }
     return schemes.get(scheme_name, schemes["executive"])
 
+# Shuffle bag: one long-lived bag per session that follows roster edits
+def get_shuffle_bag(roster):
+    """The session's shuffle bag, synced to the current roster"""
+    if "shuffle_bag" not in st.session_state:
+        st.session_state.shuffle_bag = spin_engine.ShuffleBag()
+        st.session_state.shuffle_bag_version = None
+    bag = st.session_state.shuffle_bag
+    if st.session_state.shuffle_bag_version != roster.version:
+        bag.sync(roster)
+        st.session_state.shuffle_bag_version = roster.version
+    return bag
+
+# Recency weighting: decayed win scores follow the history one result at a time
+def get_recency_weights():
+    """The session's recency scores for the current decay settings"""
+    settings = st.session_state.wheel_settings
+    tracker = st.session_state.get("recency_weights")
+    if (tracker is None or tracker.basis != settings["recency_basis"]
+            or tracker.half_life != settings["recency_half_life"]):
+        tracker = RecencyWeights(settings["recency_basis"], settings["recency_half_life"],
+                                 history_results())
+        st.session_state.recency_weights = tracker
+    return tracker
+
+# Recent Results shows the history one ledger page at a time
+HISTORY_PAGE_SIZE = 8
+
+# Weighted sampling: the alias table is rebuilt only when the roster changes
+def get_spin_sampler(roster, weights=None):
+    """Sampler for the spin weights, or None when every entry weighs 1"""
+    selection_mode = st.session_state.wheel_settings["selection_mode"]
+    if selection_mode == "shuffle_bag":
+        return get_shuffle_bag(roster)
+    if selection_mode == "recency":
+        # Recency weights move with every result, so there is nothing to cache
+        return spin_engine.AliasTable(weights)
+    if not roster.is_weighted():
+        return None
+    if st.session_state.wheel_settings["remove_winner"]:
+        # The roster's own Fenwick trees follow each removal in O(log n),
+        # where an alias table would need an O(n) rebuild after every spin
+        return roster
+    cached = st.session_state.get("spin_sampler")
+    if cached is None or cached[0] != roster.version:
+        cached = (roster.version, spin_engine.AliasTable(roster.weights()))
+        st.session_state.spin_sampler = cached
+    return cached[1]
+
+# Spin IDs come from the ledger and only advance when a spin is committed,
+# so reruns never shift the numbers magic-mode targets are keyed by
+def next_spin_number():
+    """ID the next committed spin will get"""
+    return open_ledger().next_spin_number(st.session_state.history_id)
+
+# Spin commits: the engine draws the outcome, the wheel only animates to it
+def commit_spin():
+    """Commit the armed spin outcome to the spin history"""
+    spin = st.session_state.pending_spin
+    st.session_state.pending_spin = None
+    winner = spin["winner"]
+    
+    # Stamped on the server, in the same local time as batch spins, so the
+    # history and its date filters never mix in the browser's UTC clock
+    winner_data = {
+        "winner": winner,
+        "timestamp": datetime.now().isoformat(),
+        "magic": spin["magic"]
+    }
+    # A multi-winner draw is recorded as one entry, ranked first to last
+    if "winners" in spin:
+        winner_data["winners"] = spin["winners"]
+        st.session_state.multi_draw_count = 0
+    # The ledger assigns the spin its ID
+    open_ledger().append(st.session_state.history_id, [winner_data])
+    st.session_state.results_stats.add(winner_data)
+    if "recency_weights" in st.session_state:
+        st.session_state.recency_weights.add(winner_data)
+    
+    bag = None
+    if st.session_state.wheel_settings["selection_mode"] == "shuffle_bag":
+        bag = get_shuffle_bag(st.session_state.names)
+        for drawn in spin.get("winners", [winner]):
+            bag.take(drawn)
+    
+    for drawn in spin.get("winners", [winner]):
+        if st.session_state.wheel_settings["remove_winner"] and drawn in st.session_state.names:
+            st.session_state.names.remove(drawn)
+            if bag is not None:
+                # Its turn was just taken, so the bag keeps the name's other entries
+                bag.remove_entry(drawn, drawn=True)
+            # Without duplicate entries allowed, a winner's other entries go too
+            if not st.session_state.wheel_settings["allow_duplicates"]:
+                for _ in range(st.session_state.names.count(drawn)):
+                    st.session_state.names.remove(drawn)
+                    if bag is not None:
+                        bag.remove_entry(drawn)
+    if bag is not None:
+        # The bag followed the removals itself; skip the full resync
+        st.session_state.shuffle_bag_version = st.session_state.names.version
+    
+    # Remove used magic prediction
+    if spin["magic"]:
+        st.session_state.predetermined_winners.pop(winner_data["spin_number"], None)
+    
+    st.session_state.latest_result = winner_data
+    # The analytics and the history show the new result too
+    request_full_rerun()
+    return winner_data
+
+def record_spin_result():
+    """Commit the spin the wheel just finished animating"""
+    landed = st.session_state.get("premium_wheel")
+    spin = st.session_state.pending_spin
+    # Ignore reports for an outcome that was re-armed while the wheel was spinning,
+    # or for a spin whose ID has been taken by an instant spin in the meantime
+    if not landed or not spin or landed["index"] != spin["index"]:
+        return
+    if landed["spin_number"] != next_spin_number():
+        return
+    commit_spin()
+
+def instant_spin():
+    """Commit the armed spin without animation and let the wheel replay it"""
+    if not st.session_state.pending_spin:
+        return
+    spin = st.session_state.pending_spin
+    winner_data = commit_spin()
+    st.session_state.replay_spin = {
+        "id": st.session_state.results_stats.total,
+        "index": spin["index"],
+        "stopAngle": spin["stopAngle"],
+        "winner": winner_data["winner"],
+        "magic": winner_data["magic"]
+    }
+
+def set_multi_draw(count):
+    """Arm (or with 0, cancel) a multi-winner draw for the next spin"""
+    st.session_state.multi_draw_count = count
+
+def batch_spin(count):
+    """Run ``count`` spins in one vectorized draw and append them to the history in bulk"""
+    roster = st.session_state.names
+    if not roster:
+        return
+    settings = st.session_state.wheel_settings
+    names = roster.to_list()
+    spin_number = next_spin_number()
+    
+    # Magic predictions that fall inside this batch's spin numbers
+    forced = {}
+    if st.session_state.magic_mode:
+        for number, name in st.session_state.predetermined_winners.items():
+            if spin_number <= number < spin_number + count and name in roster:
+                forced[number - spin_number] = roster.index(name)
+    
+    groups = None
+    if settings["remove_winner"] and not settings["allow_duplicates"]:
+        groups = roster.group_codes()
+    picks = spin_engine.draw_batch(
+        count, len(names),
+        weights=roster.weights() if roster.is_weighted() else None,
+        replace=not settings["remove_winner"],
+        groups=groups,
+        forced=forced
+    ).tolist()
+    
+    timestamp = datetime.now().isoformat()
+    magic_offsets = set(forced)
+    batch = [
+        {
+            "winner": names[position],
+            "timestamp": timestamp,
+            "magic": offset in magic_offsets and position == forced[offset],
+            "spin_number": spin_number + offset
+        }
+        for offset, position in enumerate(picks)
+    ]
+    open_ledger().append(st.session_state.history_id, batch)
+    if "recency_weights" in st.session_state:
+        for result in batch:
+            st.session_state.recency_weights.add(result)
+    st.session_state.results_stats.add_batch(
+        [names[position] for position in picks],
+        [result["winner"] for result in batch if result["magic"]]
+    )
+    
+    if settings["remove_winner"]:
+        # Rebuild once instead of removing the winners one by one. Without
+        # duplicates allowed a winner's other entries go too, as after a single spin
+        if groups is None:
+            drawn = set(picks)
+            kept = [i for i in range(len(names)) if i not in drawn]
+        else:
+            drawn = {groups[i] for i in picks}
+            kept = [i for i in range(len(names)) if groups[i] not in drawn]
+        weights, entry_groups = roster.weights(), roster.groups()
+        st.session_state.names = Roster(
+            [names[i] for i in kept], [weights[i] for i in kept], [entry_groups[i] for i in kept]
+        )
+    
+    for result in batch:
+        if result["magic"]:
+            st.session_state.predetermined_winners.pop(result["spin_number"], None)
+    
+    st.session_state.pending_spin = None
+    st.session_state.latest_batch = {"count": len(picks), "magic": sum(result["magic"] for result in batch)}
+    request_full_rerun()
+
+# Export is serialized only when the download is actually requested
+def export_configuration(compact=False):
+    """Callable for the export download that builds the JSON on click
+
+    Runs outside the script, so everything it needs is captured now.
+    """
+    roster = st.session_state.names
+    settings = dict(st.session_state.wheel_settings)
+    user_tier = st.session_state.user_tier
+    ledger = open_ledger()
+    history_id = st.session_state.history_id
+    
+    def build():
+        export_data = {
+            "names": roster.to_export(),
+            "settings": settings,
+            "results": list(ledger.results(history_id)),
+            "metadata": {
+                "export_date": datetime.now().isoformat(),
+                "version": "3.0.0",
+                "user_tier": user_tier
+            }
+        }
+        if compact:
+            return json.dumps(export_data, separators=(",", ":"))
+        return json.dumps(export_data, indent=2)
+    
+    return build
+
+def export_history(fmt, filters):
+    """Callable for the history download that builds the file on click"""
+    ledger = open_ledger()
+    history_id = st.session_state.history_id
+    user_tier = st.session_state.user_tier
+    
+    def build():
+        metadata = history_export.export_metadata(user_tier, filters)
+        return history_export.export_bytes(fmt, ledger.results(history_id, **filters), metadata)
+    
+    return build
+
+# Roster editor shows one page of the roster at a time
+ROSTER_PAGE_SIZE = 50
+
+def roster_page(roster, query, page):
+    """Rows ``(position, name, weight, group)`` of one editor page, the match count and the page
+
+    Without a search only the page itself is read from the roster; a search
+    scans names and groups once. Pages past the end fall back to the last one.
+    """
+    if not query:
+        page = max(0, min(page, ceil(len(roster) / ROSTER_PAGE_SIZE) - 1))
+        return list(islice(roster.rows(page * ROSTER_PAGE_SIZE), ROSTER_PAGE_SIZE)), len(roster), page
+    
+    query = query.casefold()
+    start = page * ROSTER_PAGE_SIZE
+    rows, matches = [], 0
+    for row in roster.rows():
+        if query in row[1].casefold() or (row[3] is not None and query in row[3].casefold()):
+            if start <= matches < start + ROSTER_PAGE_SIZE:
+                rows.append(row)
+            matches += 1
+    if page and not rows and matches:
+        return roster_page(roster, query, max(0, ceil(matches / ROSTER_PAGE_SIZE) - 1))
+    if not rows:
+        page = 0
+    return rows, matches, page
+
+def apply_roster_edits(rows, changes):
+    """Write the data editor's changes for one page back to the roster
+
+    Only edited, deleted and added rows are touched. Returns how many rows
+    were skipped for an empty name or, unless duplicates are allowed, a name
+    already on the roster.
+    """
+    roster = st.session_state.names
+    allow_duplicates = st.session_state.wheel_settings["allow_duplicates"]
+    skipped = 0
+    
+    def entry(values, name=None, weight=1, group=None):
+        name = str(values.get("Name", name) or "").strip()
+        weight = values.get("Weight", weight) or 1
+        group = str(values.get("Group", group) or "").strip() or None
+        return name, weight, group
+    
+    for row, values in changes["edited_rows"].items():
+        position, *current = rows[int(row)]
+        name, weight, group = entry(values, *current)
+        if not name or (name != current[0] and name in roster and not allow_duplicates):
+            skipped += 1
+            continue
+        roster.set_entry(position, name, weight, group)
+    # Highest first, so the positions of the remaining deletions stay put
+    for row in sorted(changes["deleted_rows"], reverse=True):
+        roster.pop(rows[row][0])
+    for values in changes["added_rows"]:
+        name, weight, group = entry(values)
+        if not name or (name in roster and not allow_duplicates):
+            skipped += 1
+            continue
+        roster.append(name, weight, group)
+    return skipped
+
 # Premium Header
-st.markdown("""
-<div class="premium-header">
-    <h1 class="brand-title">WheelMaster Pro™</h1>
-    <p class="brand-subtitle">The World's Most Trusted Decision Wheel Since 2019</p>
-    <div class="trust-indicators">
-        <div class="trust-badge">
-            <span class="icon">🏆</span>
-            <span>6+ Years Trusted</span>
-        </div>
-        <div class="trust-badge">
-            <span class="icon">🌍</span>
-            <span>2.1M+ Global Users</span>
-        </div>
-        <div class="trust-badge">
-            <span class="icon">🔒</span>
-            <span>Enterprise Security</span>
-        </div>
-        <div class="trust-badge">
-            <span class="icon">⚡</span>
-            <span>99.9% Uptime</span>
-        </div>
-        <div class="trust-badge">
-            <span class="icon">🎯</span>
-            <span>1.8B+ Decisions Made</span>
-        </div>
-    </div>
-</div>
-""", unsafe_allow_html=True)
+render_header()
+
+# Templates and data management rerun on their own; loading or importing refreshes the page
+@timed_fragment("data_management")
+def render_data_management():
+    # Enhanced Templates
+    st.markdown("### 📋 Executive Templates")
+    selected_template = st.selectbox(
+        "Professional Scenarios:", 
+        ["Custom Setup"] + list(st.session_state.templates.keys()),
+        help="Pre-configured for common business use cases"
+    )
+    
+    if selected_template != "Custom Setup" and st.button("🚀 Load Template", key="load_template"):
+        st.session_state.names = Roster(st.session_state.templates[selected_template])
+        set_results([])
+        st.session_state.predetermined_winners = {}
+        st.success(f"✅ Loaded: {selected_template}")
+        st.rerun()
+    
+    st.markdown("---")
+    
+    # Enhanced Data Management
+    st.markdown("### 📊 Data Management")
+    
+    if st.session_state.names:
+        compact_export = st.checkbox(
+            "Compact export", key="compact_export",
+            help="Smaller file without indentation, best for long histories"
+        )
+        st.download_button(
+            "📤 Export Configuration",
+            export_configuration(compact_export),
+            file_name=f"wheelmaster_pro_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
+            mime="application/json",
+            on_click="ignore",
+            help="Save your current setup for future use"
+        )
+    
+    if st.session_state.results_stats.total:
+        with st.expander("🗂️ History Export"):
+            history_format = st.selectbox(
+                "Format", list(history_export.FORMATS), key="history_export_format",
+                format_func={"ndjson": "NDJSON (streaming)", "csv": "CSV", "parquet": "Parquet (columnar)"}.get
+            )
+            history_dates = st.date_input("Date range", value=(), key="history_export_dates",
+                                          help="Leave empty to export every spin")
+            # A free-text exact match: listing every winner as options would send
+            # them all to the browser on each run of this fragment
+            history_winner = st.text_input(
+                "Winner", key="history_export_winner", placeholder="Everyone",
+                help="Exact participant name; leave empty to export every winner"
+            ).strip() or None
+            if history_winner is not None and history_winner not in st.session_state.results_stats.wins:
+                st.caption(f"No spins won by {history_winner!r} yet")
+            since, until = (tuple(history_dates) + (None, None))[:2]
+            filters = history_export.history_filters(since, until or since, history_winner)
+            st.download_button(
+                "📤 Export History",
+                export_history(history_format, filters),
+                file_name=history_export.export_filename(history_format),
+                mime=history_export.FORMATS[history_format][0],
+                on_click="ignore",
+                use_container_width=True
+            )
+            if history_export.ROUTE_PATH:
+                params = {"history": st.session_state.history_id, "format": history_format,
+                          "tier": st.session_state.user_tier}
+                params.update({key: value for key, value in
+                               (("since", since), ("until", until or since), ("winner", history_winner))
+                               if value is not None})
+                st.link_button("⬇️ Stream Directly", f"{history_export.ROUTE_PATH}?{urlencode(params)}",
+                               help="Streams from the server without buffering; best for very large histories",
+                               use_container_width=True)
+    
+    uploaded_file = st.file_uploader(
+        "📥 Import Configuration", 
+        type=['json'],
+        help="Upload previously exported configurations"
+    )
+    if uploaded_file and st.button("✨ Apply Configuration"):
+        # Parsed and validated in a stream; the session only changes once all of it passed
+        import_progress = st.progress(0.0, text="Reading…")
+        try:
+            imported = import_configuration(
+                uploaded_file, uploaded_file.size, open_ledger(), st.session_state.history_id,
+                st.session_state.wheel_settings,
+                progress=lambda fraction, message: import_progress.progress(fraction, text=message)
+            )
+        except ConfigImportError as e:
+            import_progress.empty()
+            st.error(f"❌ Import failed: {str(e)}")
+        else:
+            st.session_state.names = imported["roster"]
+            st.session_state.wheel_settings.update(imported["settings"])
+            st.session_state.results_stats = imported["results_stats"]
+            st.session_state.pop("recency_weights", None)
+            st.session_state.history_cursors = []
+            st.session_state.predetermined_winners = {}
+            st.success("✅ Configuration restored successfully")
+            st.rerun()
 
 # Enhanced Sidebar
 with st.sidebar:
@@ -700,12 +550,12 @@ with st.sidebar:
     # Enhanced Settings
     st.markdown("### 🎛️ Wheel Dynamics")
     st.session_state.wheel_settings["spin_duration"] = st.slider(
-        "Spin Duration (seconds)", 2, 12, st.session_state.wheel_settings["spin_duration"],
+        "Spin Duration (seconds)", *SETTING_RANGES["spin_duration"], st.session_state.wheel_settings["spin_duration"],
         help="Longer spins create more anticipation"
     )
     
     st.session_state.wheel_settings["spin_count"] = st.slider(
-        "Rotation Intensity", 3, 20, st.session_state.wheel_settings["spin_count"],
+        "Rotation Intensity", *SETTING_RANGES["spin_count"], st.session_state.wheel_settings["spin_count"],
         help="Higher values = more dramatic spins"
     )
     
@@ -716,6 +566,16 @@ with st.sidebar:
         help="Optimize for your display size"
     )
     
+    st.session_state.wheel_settings["render_mode"] = st.selectbox(
+        "Spin rendering", SETTING_CHOICES["render_mode"],
+        index=SETTING_CHOICES["render_mode"].index(st.session_state.wheel_settings["render_mode"]),
+        format_func={
+            "bitmap": "⚡ GPU (draw once, rotate)",
+            "canvas": "🖌️ Classic (redraw every frame)"
+        }.get,
+        help="GPU rendering keeps large wheels smooth; both land on the same segment"
+    )
+    
     st.markdown("### 🎨 Visual Theme")
     st.session_state.color_scheme = st.selectbox(
         "Premium Themes", 
@@ -729,6 +589,30 @@ with st.sidebar:
         help="Prevents duplicate selections in successive spins"
     )
     
+    st.session_state.wheel_settings["selection_mode"] = st.selectbox(
+        "Selection mode", SETTING_CHOICES["selection_mode"],
+        index=SETTING_CHOICES["selection_mode"].index(st.session_state.wheel_settings["selection_mode"]),
+        format_func={
+            "random": "🎲 Random every spin",
+            "shuffle_bag": "🔁 Everyone once before repeats",
+            "recency": "⏳ Recent winners less likely"
+        }.get,
+        help="Shuffle bag gives every participant a turn before anyone comes up again"
+    )
+    
+    if st.session_state.wheel_settings["selection_mode"] == "recency":
+        st.session_state.wheel_settings["recency_basis"] = st.radio(
+            "Fade recent wins by", SETTING_CHOICES["recency_basis"],
+            index=SETTING_CHOICES["recency_basis"].index(st.session_state.wheel_settings["recency_basis"]),
+            format_func={"spins": "Spins since", "time": "Minutes since"}.get,
+            horizontal=True
+        )
+        st.session_state.wheel_settings["recency_half_life"] = st.number_input(
+            "Half-life", *SETTING_RANGES["recency_half_life"],
+            value=st.session_state.wheel_settings["recency_half_life"],
+            help="A win counts half as much after this many spins (or minutes)"
+        )
+    
     st.session_state.wheel_settings["allow_duplicates"] = st.checkbox(
         "Allow duplicate entries", st.session_state.wheel_settings["allow_duplicates"],
         help="Enable multiple instances of same option"
@@ -741,64 +625,7 @@ with st.sidebar:
     
     st.markdown("---")
     
-    # Enhanced Templates
-    st.markdown("### 📋 Executive Templates")
-    selected_template = st.selectbox(
-        "Professional Scenarios:", 
-        ["Custom Setup"] + list(st.session_state.templates.keys()),
-        help="Pre-configured for common business use cases"
-    )
-    
-    if selected_template != "Custom Setup" and st.button("🚀 Load Template", key="load_template"):
-        st.session_state.names = st.session_state.templates[selected_template].copy()
-        st.session_state.spin_counter = 0
-        st.session_state.results = []
-        st.session_state.predetermined_winners = {}
-        st.success(f"✅ Loaded: {selected_template}")
-        st.rerun()
-    
-    st.markdown("---")
-    
-    # Enhanced Data Management
-    st.markdown("### 📊 Data Management")
-    
-    if st.session_state.names:
-        export_data = {
-            "names": st.session_state.names,
-            "settings": st.session_state.wheel_settings,
-            "results": st.session_state.results,
-            "metadata": {
-                "export_date": datetime.now().isoformat(),
-                "version": "3.0.0",
-                "user_tier": st.session_state.user_tier
-            }
-        }
-        st.download_button(
-            "📤 Export Configuration",
-            json.dumps(export_data, indent=2),
-            file_name=f"wheelmaster_pro_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-            mime="application/json",
-            help="Save your current setup for future use"
-        )
-    
-    uploaded_file = st.file_uploader(
-        "📥 Import Configuration", 
-        type=['json'],
-        help="Upload previously exported configurations"
-    )
-    if uploaded_file:
-        try:
-            import_data = json.load(uploaded_file)
-            if st.button("✨ Apply Configuration"):
-                st.session_state.names = import_data.get("names", [])
-                st.session_state.wheel_settings.update(import_data.get("settings", {}))
-                st.session_state.spin_counter = 0
-                st.session_state.results = import_data.get("results", [])
-                st.session_state.predetermined_winners = {}
-                st.success("✅ Configuration restored successfully")
-                st.rerun()
-        except Exception as e:
-            st.error(f"❌ Import failed: {str(e)}")
+    render_data_management()
     
     st.markdown("---")
     
@@ -848,7 +675,7 @@ with st.sidebar:
             st.markdown("#### 🎯 Outcome Control")
             
             # Enhanced magic controls
-            current_spin = st.session_state.spin_counter + 1
+            current_spin = next_spin_number()
             
             magic_type = st.radio(
                 "Control Type:",
@@ -859,7 +686,7 @@ with st.sidebar:
             if magic_type == "Next Spin Only":
                 winner = st.selectbox(
                     "Set Next Winner:", 
-                    options=st.session_state.names,
+                    options=st.session_state.names.to_list(),
                     help="This winner will be selected on the very next spin"
                 )
                 if st.button("🎯 Set Next Winner", key="set_next"):
@@ -872,7 +699,7 @@ with st.sidebar:
                     placeholder="Enter comma-separated spin numbers",
                     help="Specify which future spins to control"
                 )
-                winner = st.selectbox("Winner for these spins:", options=st.session_state.names)
+                winner = st.selectbox("Winner for these spins:", options=st.session_state.names.to_list())
                 
                 if st.button("🎪 Set Multiple Winners", key="set_multiple"):
                     try:
@@ -892,8 +719,8 @@ with st.sidebar:
                 )
                 
                 if pattern == "Alternating Winners":
-                    winner1 = st.selectbox("First Winner:", options=st.session_state.names, key="alt1")
-                    winner2 = st.selectbox("Second Winner:", options=st.session_state.names, key="alt2")
+                    winner1 = st.selectbox("First Winner:", options=st.session_state.names.to_list(), key="alt1")
+                    winner2 = st.selectbox("Second Winner:", options=st.session_state.names.to_list(), key="alt2")
                     spins_count = st.number_input("Number of spins:", min_value=2, max_value=10, value=4)
                     
                     if st.button("🔄 Set Alternating Pattern", key="set_alt"):
@@ -906,7 +733,8 @@ with st.sidebar:
 # Main content area
 col1, col2 = st.columns([0.65, 0.35], gap="large")
 
-with col1:
+@timed_fragment("wheel")
+def render_wheel():
     st.markdown("""
     <div class="premium-card">
         <div class="card-header">
@@ -933,581 +761,134 @@ with col1:
         # Enhanced wheel rendering
         colors = get_premium_color_scheme(st.session_state.color_scheme)
         names_js = st.session_state.names
-        st.session_state.spin_counter += 1
-        current_spin = st.session_state.spin_counter
+        current_spin = next_spin_number()
         
+        # Grouped rosters colour by group so teams read as blocks on the wheel
+        if names_js.is_grouped():
+            group_colors = {}
+            color_index = [group_colors.setdefault(group, len(group_colors)) for group in names_js.groups()]
+        else:
+            color_index = range(len(names_js))
         segments_data = [
             {"fillStyle": colors[i % len(colors)], "text": name, "textFillStyle": "#FFFFFF"}
-            for i, name in enumerate(names_js)
+            for i, name in zip(color_index, names_js)
         ]
         
-        # Enhanced wheel HTML with premium animations
-        wheel_html = f"""
-        <html>
-        <head>
-            <script src="https://cdnjs.cloudflare.com/ajax/libs/gsap/3.12.2/gsap.min.js"></script>
-            <script src="https://cdn.jsdelivr.net/gh/zarocknz/javascript-winwheel/Winwheel.min.js"></script>
-            <style>
-                @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700;800&family=Playfair+Display:wght@600;700;800&display=swap');
-                
-                body {{
-                    font-family: 'Inter', sans-serif;
-                    margin: 0;
-                    padding: 20px;
-                    background: linear-gradient(135deg, #0a0b0f 0%, #1a1d29 100%);
-                    display: flex;
-                    flex-direction: column;
-                    align-items: center;
-                    min-height: 100vh;
-                    color: white;
-                }}
-                
-                .wheel-container {{
-                    position: relative;
-                    display: flex;
-                    justify-content: center;
-                    align-items: center;
-                    margin-bottom: 3rem;
-                    padding: 2rem;
-                    background: radial-gradient(circle at center, rgba(102, 126, 234, 0.1) 0%, transparent 70%);
-                    border-radius: 50%;
-                }}
-                
-                .wheel-glow {{
-                    position: absolute;
-                    top: 50%;
-                    left: 50%;
-                    transform: translate(-50%, -50%);
-                    width: {st.session_state.wheel_size + 60}px;
-                    height: {st.session_state.wheel_size + 60}px;
-                    border-radius: 50%;
-                    background: conic-gradient(from 0deg, 
-                        rgba(102, 126, 234, 0.3), 
-                        rgba(245, 87, 108, 0.3),
-                        rgba(79, 172, 254, 0.3),
-                        rgba(102, 126, 234, 0.3));
-                    animation: wheel-glow 4s linear infinite;
-                    z-index: 1;
-                }}
-                
-                @keyframes wheel-glow {{
-                    0% {{ transform: translate(-50%, -50%) rotate(0deg); }}
-                    100% {{ transform: translate(-50%, -50%) rotate(360deg); }}
-                }}
-                
-                #canvas {{
-                    position: relative;
-                    z-index: 5;
-                    border-radius: 50%;
-                    box-shadow: 
-                        0 0 50px rgba(102, 126, 234, 0.4),
-                        inset 0 0 30px rgba(0, 0, 0, 0.3);
-                    transition: all 0.3s ease;
-                }}
-                
-                #canvas:hover {{
-                    box-shadow: 
-                        0 0 80px rgba(102, 126, 234, 0.6),
-                        inset 0 0 30px rgba(0, 0, 0, 0.3);
-                }}
-                
-                #pointer {{
-                    position: absolute;
-                    top: -15px;
-                    left: 50%;
-                    transform: translateX(-50%);
-                    width: 0;
-                    height: 0;
-                    border-left: 25px solid transparent;
-                    border-right: 25px solid transparent;
-                    border-bottom: 60px solid #667eea;
-                    filter: drop-shadow(0px 6px 12px rgba(102, 126, 234, 0.6));
-                    z-index: 10;
-                    transition: all 0.3s ease;
-                }}
-                
-                .spin-button {{
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    border: none;
-                    padding: 20px 40px;
-                    border-radius: 16px;
-                    font-size: 1.3rem;
-                    font-weight: 700;
-                    cursor: pointer;
-                    transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1);
-                    box-shadow: 
-                        0 8px 32px rgba(102, 126, 234, 0.4),
-                        inset 0 1px 0 rgba(255, 255, 255, 0.2);
-                    font-family: inherit;
-                    position: relative;
-                    overflow: hidden;
-                    text-transform: uppercase;
-                    letter-spacing: 0.05em;
-                    min-width: 200px;
-                }}
-                
-                .spin-button::before {{
-                    content: '';
-                    position: absolute;
-                    top: 0;
-                    left: -100%;
-                    width: 100%;
-                    height: 100%;
-                    background: linear-gradient(90deg, 
-                        transparent, 
-                        rgba(255, 255, 255, 0.3), 
-                        transparent);
-                    transition: left 0.5s;
-                }}
-                
-                .spin-button:hover {{
-                    transform: translateY(-3px) scale(1.05);
-                    box-shadow: 
-                        0 12px 40px rgba(102, 126, 234, 0.6),
-                        inset 0 1px 0 rgba(255, 255, 255, 0.3);
-                }}
-                
-                .spin-button:hover::before {{
-                    left: 100%;
-                }}
-                
-                .spin-button:active {{
-                    transform: translateY(-1px) scale(1.02);
-                }}
-                
-                .spin-button:disabled {{
-                    opacity: 0.7;
-                    cursor: not-allowed;
-                    transform: none;
-                    animation: pulse 2s infinite;
-                }}
-                
-                @keyframes pulse {{
-                    0%, 100% {{ opacity: 0.7; }}
-                    50% {{ opacity: 0.9; }}
-                }}
-                
-                .magic-button {{
-                    background: linear-gradient(135deg, #7c3aed 0%, #5b21b6 100%) !important;
-                    box-shadow: 
-                        0 8px 32px rgba(124, 58, 237, 0.4),
-                        inset 0 1px 0 rgba(255, 255, 255, 0.2) !important;
-                }}
-                
-                .magic-button:hover {{
-                    box-shadow: 
-                        0 12px 40px rgba(124, 58, 237, 0.6),
-                        inset 0 1px 0 rgba(255, 255, 255, 0.3) !important;
-                }}
-                
-                .magic-indicator {{
-                    position: absolute;
-                    top: -15px;
-                    right: -15px;
-                    background: linear-gradient(135deg, #7c3aed 0%, #a855f7 100%);
-                    color: white;
-                    border-radius: 50%;
-                    width: 40px;
-                    height: 40px;
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                    font-size: 1.2rem;
-                    animation: magic-pulse 2s infinite;
-                    z-index: 15;
-                    box-shadow: 0 4px 20px rgba(124, 58, 237, 0.6);
-                }}
-                
-                @keyframes magic-pulse {{
-                    0%, 100% {{ 
-                        transform: scale(1); 
-                        box-shadow: 0 4px 20px rgba(124, 58, 237, 0.6);
-                    }}
-                    50% {{ 
-                        transform: scale(1.1); 
-                        box-shadow: 0 6px 30px rgba(124, 58, 237, 0.8);
-                    }}
-                }}
-                
-                #winner {{
-                    font-family: 'Playfair Display', serif;
-                    font-size: 2.2rem;
-                    font-weight: 700;
-                    margin-top: 2rem;
-                    color: #667eea;
-                    text-align: center;
-                    min-height: 80px;
-                    display: flex;
-                    align-items: center;
-                    justify-content: center;
-                    background: linear-gradient(135deg, rgba(102, 126, 234, 0.1) 0%, rgba(118, 75, 162, 0.1) 100%);
-                    border-radius: 16px;
-                    padding: 1.5rem;
-                    border: 1px solid rgba(102, 126, 234, 0.3);
-                    backdrop-filter: blur(10px);
-                    text-shadow: 0 2px 10px rgba(102, 126, 234, 0.5);
-                    transition: all 0.3s ease;
-                    
-                }}
-                
-                #winner.magic-winner {{
-                    color: #a78bfa;
-                    border-color: rgba(167, 139, 250, 0.5);
-                    background: linear-gradient(135deg, rgba(124, 58, 237, 0.1) 0%, rgba(168, 85, 247, 0.1) 100%);
-                    text-shadow: 0 2px 15px rgba(167, 139, 250, 0.7);
-                    animation: magic-glow 2s ease-in-out infinite alternate;
-                }}
-                
-                @keyframes magic-glow {{
-                    from {{ 
-                        box-shadow: 0 0 20px rgba(167, 139, 250, 0.4);
-                    }}
-                    to {{ 
-                        box-shadow: 0 0 40px rgba(167, 139, 250, 0.7);
-                    }}
-                }}
-                
-                .wheel-stats {{
-                    display: grid;
-                    grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
-                    gap: 1.5rem;
-                    margin-top: 2rem;
-                    max-width: 800px;
-                    width: 100%;
-                }}
-                
-                .stat-item {{
-                    background: rgba(255, 255, 255, 0.05);
-                    padding: 1rem 1.5rem;
-                    border-radius: 12px;
-                    text-align: center;
-                    border: 1px solid rgba(255, 255, 255, 0.1);
-                    backdrop-filter: blur(10px);
-                    transition: all 0.3s ease;
-                }}
-                
-                .stat-item:hover {{
-                    background: rgba(255, 255, 255, 0.08);
-                    transform: translateY(-2px);
-                    border-color: rgba(102, 126, 234, 0.3);
-                }}
-                
-                .stat-label {{
-                    font-size: 0.85rem;
-                    color: rgba(255, 255, 255, 0.7);
-                    text-transform: uppercase;
-                    letter-spacing: 0.05em;
-                    margin-bottom: 0.25rem;
-                }}
-                
-                .stat-value {{
-                    font-size: 1.1rem;
-                    font-weight: 600;
-                    color: #667eea;
-                }}
-                
-                .magic-stat {{
-                    background: linear-gradient(135deg, rgba(124, 58, 237, 0.2) 0%, rgba(168, 85, 247, 0.1) 100%);
-                    border-color: rgba(167, 139, 250, 0.3);
-                }}
-                
-                .magic-stat .stat-value {{
-                    color: #a78bfa;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="wheel-container">
-                <div class="wheel-glow"></div>
-                <canvas id='canvas' width='{st.session_state.wheel_size}' height='{st.session_state.wheel_size}'></canvas>
-                <div id="pointer"></div>
-                {f'<div class="magic-indicator">🎩</div>' if st.session_state.magic_mode else ''}
-            </div>
-            
-            <button id="spinBtn" class="spin-button {('magic-button' if st.session_state.magic_mode else '')}" onclick="startSpin()">
-                {'🎩 Magic Spin' if st.session_state.magic_mode else '🎯 Spin the Wheel'}
-            </button>
-            
-            <div id="winner"></div>
-            
-            <div class="wheel-stats">
-                <div class="stat-item">
-                    <div class="stat-label">Participants</div>
-                    <div class="stat-value">{len(st.session_state.names)}</div>
-                </div>
-                <div class="stat-item">
-                    <div class="stat-label">Duration</div>
-                    <div class="stat-value">{st.session_state.wheel_settings['spin_duration']}s</div>
-                </div>
-                <div class="stat-item">
-                    <div class="stat-label">Intensity</div>
-                    <div class="stat-value">{st.session_state.wheel_settings['spin_count']}x</div>
-                </div>
-                {'<div class="stat-item magic-stat"><div class="stat-label">Magic Mode</div><div class="stat-value">🎩 Active</div></div>' if st.session_state.magic_mode else ''}
-            </div>
-            
-            <input type="hidden" id="winnerInput" value="">
-            
-            <script>
-                const magicMode = {str(st.session_state.magic_mode).lower()};
-                const predeterminedWinners = {json.dumps(st.session_state.predetermined_winners)};
-                const participantNames = {json.dumps(names_js)};
-                let currentSpinNumber = {current_spin};
-                
-                let wheel = new Winwheel({{
-                    'canvasId': 'canvas',
-                    'numSegments': {len(segments_data)},
-                    'outerRadius': {st.session_state.wheel_size // 2 - 15},
-                    'innerRadius': 40,
-                    'segments': {json.dumps(segments_data)},
-                    'textFontSize': {max(12, min(18, st.session_state.wheel_size // 25))},
-                    'textFontFamily': 'Inter',
-                    'textFontWeight': '600',
-                    'textAlignment': 'center',
-                    'textDirection': 'reversed',
-                    'textMargin': 15,
-                    'strokeStyle': '#ffffff',
-                    'lineWidth': 3,
-                    'animation': {{
-                        'type': 'spinToStop',
-                        'duration': {st.session_state.wheel_settings['spin_duration']},
-                        'spins': {st.session_state.wheel_settings['spin_count']},
-                        'easing': 'Power3.easeOut',
-                        'callbackFinished': displayWinner,
-                        'callbackAfter': function() {{
-                            document.getElementById('spinBtn').disabled = false;
-                            document.getElementById('spinBtn').innerHTML = magicMode ? '🎩 Magic Spin' : '🎯 Spin Again';
-                        }}
-                    }}
-                }});
-                
-                function startSpin() {{
-                    console.log('Starting premium spin #' + currentSpinNumber);
-                    const btn = document.getElementById('spinBtn');
-                    btn.disabled = true;
-                    btn.innerHTML = '🌀 Spinning...';
-                    
-                    // Reset winner display
-                    const winnerEl = document.getElementById("winner");
-                    winnerEl.innerHTML = "";
-                    winnerEl.className = "";
-                    document.getElementById("winnerInput").value = "";
-                    
-                    wheel.stopAnimation(false);
-                    wheel.rotationAngle = 0;
-                    
-                    // Enhanced magic mode logic
-                    if (magicMode && predeterminedWinners[currentSpinNumber]) {{
-                        const targetWinner = predeterminedWinners[currentSpinNumber];
-                        const targetIndex = participantNames.indexOf(targetWinner);
-                        
-                        if (targetIndex !== -1) {{
-                            console.log('🎩 Magic targeting: ' + targetWinner + ' at index ' + targetIndex);
-                            const segmentAngle = 360 / {len(segments_data)};
-                            const targetAngle = targetIndex * segmentAngle + (segmentAngle / 2);
-                            
-                            // Add subtle randomness for natural appearance
-                            const naturalOffset = (Math.random() - 0.5) * (segmentAngle * 0.6);
-                            wheel.animation.stopAngle = targetAngle + naturalOffset;
-                            
-                            // Magic visual effects
-                            document.querySelector('.wheel-glow').style.animation = 'wheel-glow 1s linear infinite';
-                            document.getElementById('pointer').style.filter = 'drop-shadow(0px 6px 12px rgba(124, 58, 237, 0.8))';
-                        }}
-                    }} else {{
-                        // Pure random spin
-                        wheel.animation.stopAngle = null;
-                        console.log('🎲 Random spin for #' + currentSpinNumber);
-                        document.querySelector('.wheel-glow').style.animation = 'wheel-glow 4s linear infinite';
-                        document.getElementById('pointer').style.filter = 'drop-shadow(0px 6px 12px rgba(102, 126, 234, 0.6))';
-                    }}
-                    
-                    wheel.startAnimation();
-                    
-                    // Premium audio experience
-                    {f"playPremiumSpinSound(magicMode);" if st.session_state.wheel_settings['sound_enabled'] else ""}
-                }}
-                
-                function displayWinner(indicatedSegment) {{
-                    const isPreset = magicMode && predeterminedWinners[currentSpinNumber] === indicatedSegment.text;
-                    const winnerElement = document.getElementById("winner");
-                    
-                    if (isPreset) {{
-                        winnerElement.innerHTML = "🎩✨ " + indicatedSegment.text + " ✨🎩";
-                        winnerElement.className = "magic-winner";
-                        
-                        // Magic celebration effects
-                        setTimeout(() => {{
-                            createMagicParticles();
-                        }}, 100);
-                    }} else {{
-                        winnerElement.innerHTML = "🏆 " + indicatedSegment.text + " 🏆";
-                        winnerElement.className = "";
-                    }}
-                    
-                    document.getElementById("winnerInput").value = JSON.stringify({{
-                        winner: indicatedSegment.text,
-                        timestamp: new Date().toISOString(),
-                        magic: isPreset,
-                        spin_number: currentSpinNumber
-                    }});
-                    
-                    console.log('🎉 Winner: ' + indicatedSegment.text + (isPreset ? ' (Magic!)' : ' (Random)'));
-                    
-                    // Celebration sound
-                    {f"playWinnerSound(isPreset);" if st.session_state.wheel_settings['sound_enabled'] else ""}
-                }}
-                
-                function playPremiumSpinSound(isMagic = false) {{
-                    const audioContext = new (window.AudioContext || window.webkitAudioContext)();
-                    const oscillator = audioContext.createOscillator();
-                    const gainNode = audioContext.createGain();
-                    
-                    oscillator.connect(gainNode);
-                    gainNode.connect(audioContext.destination);
-                    
-                    if (isMagic) {{
-                        // Magical ethereal sound
-                        oscillator.frequency.setValueAtTime(1400, audioContext.currentTime);
-                        oscillator.frequency.exponentialRampToValueAtTime(800, audioContext.currentTime + 0.4);
-                        oscillator.frequency.exponentialRampToValueAtTime(1200, audioContext.currentTime + 0.8);
-                        oscillator.type = 'sine';
-                    }} else {{
-                        // Professional spin sound
-                        oscillator.frequency.setValueAtTime(1000, audioContext.currentTime);
-                        oscillator.frequency.exponentialRampToValueAtTime(300, audioContext.currentTime + 0.6);
-                        oscillator.type = 'triangle';
-                    }}
-                    
-                    gainNode.gain.setValueAtTime(0.2, audioContext.currentTime);
-                    gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.8);
-                    
-                    oscillator.start(audioContext.currentTime);
-                    oscillator.stop(audioContext.currentTime + 0.8);
-                }}
-                
-                function playWinnerSound(isMagic = false) {{
-                    setTimeout(() => {{
-                        const audioContext = new (window.AudioContext || window.webkitAudioContext)();
-                        
-                        if (isMagic) {{
-                            // Magic winner chimes
-                            [1200, 1400, 1600].forEach((freq, i) => {{
-                                setTimeout(() => {{
-                                    const osc = audioContext.createOscillator();
-                                    const gain = audioContext.createGain();
-                                    
-                                    osc.connect(gain);
-                                    gain.connect(audioContext.destination);
-                                    
-                                    osc.frequency.value = freq;
-                                    osc.type = 'sine';
-                                    gain.gain.setValueAtTime(0.3, audioContext.currentTime);
-                                    gain.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.5);
-                                    
-                                    osc.start();
-                                    osc.stop(audioContext.currentTime + 0.5);
-                                }}, i * 150);
-                            }});
-                        }} else {{
-                            // Standard celebration
-                            const osc = audioContext.createOscillator();
-                            const gain = audioContext.createGain();
-                            
-                            osc.connect(gain);
-                            gain.connect(audioContext.destination);
-                            
-                            osc.frequency.setValueAtTime(800, audioContext.currentTime);
-                            osc.frequency.exponentialRampToValueAtTime(1200, audioContext.currentTime + 0.3);
-                            osc.type = 'square';
-                            gain.gain.setValueAtTime(0.2, audioContext.currentTime);
-                            gain.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.4);
-                            
-                            osc.start();
-                            osc.stop(audioContext.currentTime + 0.4);
-                        }}
-                    }}, 500);
-                }}
-                
-                function createMagicParticles() {{
-                    // Create magical particle effect for magic wins
-                    for (let i = 0; i < 20; i++) {{
-                        const particle = document.createElement('div');
-                        particle.innerHTML = '✨';
-                        particle.style.position = 'absolute';
-                        particle.style.fontSize = Math.random() * 20 + 10 + 'px';
-                        particle.style.color = ['#a78bfa', '#c084fc', '#e879f9'][Math.floor(Math.random() * 3)];
-                        particle.style.left = Math.random() * window.innerWidth + 'px';
-                        particle.style.top = Math.random() * window.innerHeight + 'px';
-                        particle.style.pointerEvents = 'none';
-                        particle.style.zIndex = '1000';
-                        particle.style.animation = 'float 2s ease-out forwards';
-                        
-                        document.body.appendChild(particle);
-                        
-                        setTimeout(() => {{
-                            particle.remove();
-                        }}, 2000);
-                    }}
-                }}
-                
-                // Add floating animation for particles
-                const style = document.createElement('style');
-                style.textContent = `
-                    @keyframes float {{
-                        0% {{ 
-                            opacity: 1; 
-                            transform: translateY(0px) rotate(0deg) scale(1); 
-                        }}
-                        100% {{ 
-                            opacity: 0; 
-                            transform: translateY(-100px) rotate(180deg) scale(0.5); 
-                        }}
-                    }}
-                `;
-                document.head.appendChild(style);
-            </script>
-        </body>
-        </html>
-        """
+        # Arm the next outcome once; it is only redrawn when the roster or the
+        # magic target changes, never on an unrelated rerun
+        forced_winner = (st.session_state.predetermined_winners.get(current_spin)
+                         if st.session_state.magic_mode else None)
+        draw_count = st.session_state.multi_draw_count
+        settings = st.session_state.wheel_settings
+        selection_mode = settings["selection_mode"]
+        decay = (settings["recency_basis"], settings["recency_half_life"]) if selection_mode == "recency" else None
+        pending = st.session_state.pending_spin
+        rearm = (pending is None or pending["roster_version"] != names_js.version
+                 or pending["forced"] != forced_winner or pending["draw_count"] != draw_count
+                 or pending["selection_mode"] != selection_mode or pending["decay"] != decay)
         
-        # Render the premium wheel
-        components.html(wheel_html, height=st.session_state.wheel_size + 500)
+        # Effective weights are frozen with the armed spin so the slices the
+        # wheel draws always match the angle it was told to stop at
+        if not rearm:
+            weights = pending["weights"]
+        elif selection_mode == "recency":
+            weights = get_recency_weights().weights(names_js.entries())
+        else:
+            weights = names_js.weights() if names_js.is_weighted() else None
+        if weights is not None:
+            # Weighted entries get a slice of the wheel proportional to their odds
+            for segment, size in zip(segments_data, spin_engine.weighted_sizes(weights)):
+                segment["size"] = size
+                if selection_mode == "recency":
+                    segment["odds"] = f"{size / 360:.1%}"
         
-        # Winner capture simulation (in real implementation, this would be handled by JavaScript)
-        if st.button("🎯 Simulate Spin Result (Demo)", key="demo_spin"):
-            if st.session_state.magic_mode and current_spin in st.session_state.predetermined_winners:
-                winner = st.session_state.predetermined_winners[current_spin]
-                is_magic = True
+        if rearm:
+            forced_index = names_js.index(forced_winner) if forced_winner in names_js else None
+            if draw_count:
+                # Winners are distinct people, so duplicate entries share a group
+                groups = None if names_js.distinct_count() == len(names_js) else names_js.group_codes()
+                pending = spin_engine.draw_winners(
+                    segments_data, draw_count, weights=weights, groups=groups, forced_index=forced_index
+                )
             else:
-                winner = random.choice(st.session_state.names)
-                is_magic = False
-            
-            winner_data = {
-                "winner": winner,
-                "timestamp": datetime.now().isoformat(),
-                "magic": is_magic,
-                "spin_number": current_spin
-            }
-            st.session_state.results.append(winner_data)
-            
-            if st.session_state.wheel_settings["remove_winner"] and winner in st.session_state.names:
-                st.session_state.names.remove(winner)
-            
-            # Remove used magic prediction
-            if is_magic and current_spin in st.session_state.predetermined_winners:
-                del st.session_state.predetermined_winners[current_spin]
-            
-            if is_magic:
-                st.success(f"🎩✨ **Magic Result:** {winner} ✨🎩")
+                sampler = get_spin_sampler(names_js, weights)
+                pending = spin_engine.draw_spin(segments_data, forced_index=forced_index, sampler=sampler)
+            pending["roster_version"] = names_js.version
+            pending["forced"] = forced_winner
+            pending["draw_count"] = draw_count
+            pending["selection_mode"] = selection_mode
+            pending["decay"] = decay
+            pending["weights"] = weights
+            st.session_state.pending_spin = pending
+        
+        # Render the premium wheel (mounted once; reruns only post new state)
+        premium_wheel(
+            segments=segments_data,
+            settings=st.session_state.wheel_settings,
+            wheel_size=st.session_state.wheel_size,
+            magic_mode=st.session_state.magic_mode,
+            spin={"index": pending["index"], "stopAngle": pending["stopAngle"],
+                  "winner": pending["winner"], "magic": pending["magic"]},
+            replay=st.session_state.replay_spin,
+            assets=vendor_urls(),
+            spin_number=current_spin,
+            key="premium_wheel",
+            on_change=record_spin_result,
+        )
+        
+        st.button(
+            "⚡ Instant Spin", key="instant_spin", on_click=instant_spin,
+            help="Decide the next spin immediately without waiting for the animation"
+        )
+        if selection_mode == "shuffle_bag":
+            st.caption(f"🔁 {len(get_shuffle_bag(names_js))} of {len(names_js)} still to come this round")
+        
+        with st.expander("🎲 Batch Spins"):
+            batch_count = st.number_input(
+                "Number of spins:", min_value=1, max_value=1_000_000, value=100, step=100,
+                key="batch_count",
+                help="Runs every spin in one draw; respects auto-remove and duplicate settings"
+            )
+            st.button(
+                "🎲 Run Batch", key="run_batch", on_click=batch_spin,
+                args=(int(batch_count),), use_container_width=True
+            )
+        
+        with st.expander("🏅 Multi-Winner Draw"):
+            max_winners = names_js.distinct_count()
+            if max_winners < 2:
+                st.caption("Add at least two different participants to draw several winners")
             else:
-                st.success(f"🏆 **Winner:** {winner}")
-            
-            st.rerun()
+                winners_count = st.number_input(
+                    "Number of winners:", min_value=2, max_value=max_winners,
+                    value=min(3, max_winners), key="winners_count",
+                    help="Draws distinct winners in one go; the wheel lands on first place"
+                )
+                if draw_count:
+                    st.info(f"🏅 Next spin draws {draw_count} winners")
+                    st.button("✖️ Cancel Multi-Winner Draw", key="cancel_multi_draw",
+                              on_click=set_multi_draw, args=(0,), use_container_width=True)
+                else:
+                    st.button(f"🏅 Draw {winners_count} Winners on Next Spin", key="arm_multi_draw",
+                              on_click=set_multi_draw, args=(int(winners_count),), use_container_width=True)
+        
+        latest_batch = st.session_state.pop("latest_batch", None)
+        if latest_batch:
+            st.success(f"🎲 **Batch complete:** {latest_batch['count']:,} spins recorded"
+                       + (f" ({latest_batch['magic']} magic)" if latest_batch["magic"] else ""))
+        
+        latest_result = st.session_state.pop("latest_result", None)
+        if latest_result:
+            if "winners" in latest_result:
+                ranking = "  \n".join(f"{place}. {name}" for place, name in enumerate(latest_result["winners"], 1))
+                st.success(f"🏅 **Winners:**  \n{ranking}")
+            elif latest_result["magic"]:
+                st.success(f"🎩✨ **Magic Result:** {latest_result['winner']} ✨🎩")
+            else:
+                st.success(f"🏆 **Winner:** {latest_result['winner']}")
 
-# Enhanced Right Panel
-with col2:
+@timed_fragment("live_analytics")
+def render_live_analytics():
     # Premium Statistics
     st.markdown("""
     <div class="premium-card">
@@ -1526,11 +907,11 @@ with col2:
             <div class="metric-label">Active Participants</div>
         </div>
         <div class="premium-metric">
-            <div class="metric-value">{len(st.session_state.results)}</div>
+            <div class="metric-value">{st.session_state.results_stats.total}</div>
             <div class="metric-label">Total Spins</div>
         </div>
         <div class="premium-metric">
-            <div class="metric-value">{sum(1 for r in st.session_state.results if r.get('magic', False))}</div>
+            <div class="metric-value">{st.session_state.results_stats.magic_total}</div>
             <div class="metric-label">Magic Spins</div>
         </div>
         <div class="premium-metric">
@@ -1539,7 +920,9 @@ with col2:
         </div>
     </div>
     """, unsafe_allow_html=True)
-    
+
+@timed_fragment("participants")
+def render_participants():
     # Participant Management
     st.markdown("""
     <div class="premium-card">
@@ -1552,19 +935,25 @@ with col2:
     
     # Enhanced participant input
     with st.container():
-        new_name = st.text_input(
-            "Add New Participant:", 
-            placeholder="Enter full name or identifier",
-            help="Professional naming recommended for business use"
-        )
+        col_name, col_weight = st.columns([3, 1])
+        with col_name:
+            new_name = st.text_input(
+                "Add New Participant:", 
+                placeholder="Enter full name or identifier",
+                help="Professional naming recommended for business use"
+            )
+        with col_weight:
+            new_weight = st.number_input(
+                "Weight:", min_value=0.1, value=1.0, step=0.5,
+                help="Relative chance of winning; also sets the size of the slice"
+            )
         
         col_add1, col_add2 = st.columns([3, 1])
         with col_add1:
             if st.button("➕ Add Participant", key="add_single", use_container_width=True):
                 if new_name:
                     if new_name not in st.session_state.names or st.session_state.wheel_settings["allow_duplicates"]:
-                        st.session_state.names.append(new_name)
-                        st.session_state.spin_counter = 0
+                        st.session_state.names.append(new_name, new_weight)
                         st.success(f"✅ Added: {new_name}")
                         st.rerun()
                     else:
@@ -1574,86 +963,217 @@ with col2:
             if st.button("🔄", key="clear_input", help="Clear input"):
                 st.rerun()
     
-    # Bulk participant management
-    st.markdown("#### 📝 Bulk Editor")
-    names_text = '\n'.join(st.session_state.names)
-    edited_names = st.text_area(
-        "Edit all participants:",
-        value=names_text,
-        height=200,
-        help="One participant per line. Changes apply immediately."
-    )
-    
-    col_bulk1, col_bulk2 = st.columns(2)
-    with col_bulk1:
+    # Roster editor: a searchable grid over one page, so a rerun only sends
+    # that page and applying writes back just the rows that changed. The grid
+    # goes through pandas, so it is only built once the editor is opened
+    if st.toggle("📝 Roster Editor", key="show_roster_editor",
+                 help="Search, edit and page through the participants"):
+        roster = st.session_state.names
+        col_search, col_page = st.columns([3, 1])
+        with col_search:
+            roster_query = st.text_input(
+                "Search participants:", key="roster_query", placeholder="Name or group",
+                on_change=lambda: st.session_state.update(roster_page=1)
+            )
+        editor_rows, matches, page = roster_page(roster, roster_query, st.session_state.get("roster_page", 1) - 1)
+        st.session_state.roster_page = page + 1
+        with col_page:
+            st.number_input("Page", min_value=1, max_value=max(1, ceil(matches / ROSTER_PAGE_SIZE)), key="roster_page")
+        
+        import pandas as pd
+        
+        editor_key = f"roster_editor_{roster.version}_{page}_{roster_query}"
+        st.data_editor(
+            # Typed columns, so an empty page still counts as text for the editor
+            pd.DataFrame({
+                "Name": [row[1] for row in editor_rows],
+                "Weight": [float(row[2]) for row in editor_rows],
+                "Group": [row[3] for row in editor_rows],
+            }).astype({"Name": object, "Weight": float, "Group": object}),
+            key=editor_key,
+            num_rows="dynamic",
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                "Name": st.column_config.TextColumn(required=True),
+                "Weight": st.column_config.NumberColumn(min_value=0.1, step=0.5, default=1.0),
+                "Group": st.column_config.TextColumn(),
+            }
+        )
+        st.caption(f"{matches:,} {'matching ' if roster_query else ''}participants · "
+                   f"page {page + 1} of {max(1, ceil(matches / ROSTER_PAGE_SIZE))}")
+        
         if st.button("💾 Apply Changes", key="update_all"):
-            new_names = [name.strip() for name in edited_names.split('\n') if name.strip()]
-            if new_names:
-                st.session_state.names = new_names
-                st.session_state.spin_counter = 0
+            skipped = apply_roster_edits(editor_rows, st.session_state[editor_key])
+            if skipped:
+                st.warning(f"⚠️ {skipped} rows skipped (empty or duplicate name)")
+            else:
                 st.success("✅ Participants updated")
-                st.rerun()
+            st.rerun()
     
-    with col_bulk2:
-        if st.button("🗑️ Clear All", key="clear_all"):
-            st.session_state.names = []
-            st.session_state.spin_counter = 0
-            st.session_state.results = []
-            st.session_state.predetermined_winners = {}
-            st.info("🔄 All participants cleared")
+    if st.button("🗑️ Clear All", key="clear_all"):
+        st.session_state.names = Roster()
+        set_results([])
+        st.session_state.predetermined_winners = {}
+        st.info("🔄 All participants cleared")
+        st.rerun()
+    
+    with st.expander("➕ Paste Several"):
+        pasted = st.text_area(
+            "Participants to add:", key="bulk_add", height=120,
+            help="One participant per line, optionally weighted as 'Name | 3' or grouped as 'Name | 3 | Team'"
+        )
+        if st.button("➕ Add All", key="add_pasted", disabled=not pasted.strip()):
+            roster = st.session_state.names
+            for name, weight, group in map(parse_entry, pasted.splitlines()):
+                if name and (name not in roster or st.session_state.wheel_settings["allow_duplicates"]):
+                    roster.append(name, weight, group)
+            del st.session_state.bulk_add
             st.rerun()
+    
+    # Spreadsheet import, streamed row by row into a fresh roster
+    with st.expander("📥 Import from Spreadsheet"):
+        roster_file = st.file_uploader(
+            "Participant sheet", type=roster_import.EXTENSIONS, key="roster_file",
+            help="CSV, TSV or XLSX with a header row; columns for weight, group and active are optional"
+        )
+        imported_counts = st.session_state.pop("roster_import_counts", None)
+        if imported_counts:
+            st.success("✅ Imported {added:,} participants".format(**imported_counts)
+                       + "".join(f" · {imported_counts[key]:,} {key}"
+                                 for key in ("duplicates", "inactive", "invalid") if imported_counts[key]))
+        if roster_file:
+            try:
+                header = roster_import.read_header(roster_file, roster_file.name)
+            except roster_import.RosterImportError as e:
+                st.error(f"❌ {e}")
+            else:
+                guessed = roster_import.guess_mapping(header)
+                columns = [None] + list(range(len(header)))
+                mapping = {}
+                for field in roster_import.FIELDS:
+                    mapping[field] = st.selectbox(
+                        f"{field.capitalize()} column", columns,
+                        index=columns.index(guessed.get(field)),
+                        format_func=lambda column: "—" if column is None else header[column],
+                        key=f"roster_column_{field}"
+                    )
+                replace_roster = st.radio(
+                    "Imported participants", [True, False], horizontal=True,
+                    format_func={True: "Replace roster", False: "Add to roster"}.get
+                )
+                if st.button("📥 Import Participants", disabled=mapping["name"] is None, use_container_width=True):
+                    base = st.session_state.names
+                    # Appending to a copy keeps the live roster intact if the sheet is rejected
+                    roster = Roster() if replace_roster else Roster(base.to_list(), base.weights(), base.groups())
+                    import_progress = st.progress(0.0, text="Reading…")
+                    try:
+                        rows = roster_import.open_rows(roster_file, roster_file.name)
+                        next(rows, None)
+                        roster, counts = roster_import.load_roster(
+                            rows, mapping, roster,
+                            allow_duplicates=st.session_state.wheel_settings["allow_duplicates"],
+                            on_progress=lambda read: import_progress.progress(
+                                min(roster_file.tell() / max(roster_file.size, 1), 1.0),
+                                text=f"Reading… {read:,} rows"
+                            )
+                        )
+                    except roster_import.RosterImportError as e:
+                        import_progress.empty()
+                        st.error(f"❌ Import failed: {e}")
+                    else:
+                        st.session_state.names = roster
+                        st.session_state.roster_import_counts = counts
+                        st.rerun()
 
-# Enhanced Results Section
-st.markdown("""
-<div class="premium-card">
-    <div class="card-header">
-        <span class="card-icon">🏆</span>
-        <h3 class="card-title">Decision History & Analytics</h3>
-    </div>
-</div>
-""", unsafe_allow_html=True)
+with col1:
+    render_wheel()
 
-if st.session_state.results:
-    results_df = pd.DataFrame(st.session_state.results)
-    
-    col_hist1, col_hist2 = st.columns([0.6, 0.4])
+# Enhanced Right Panel
+with col2:
+    render_live_analytics()
+    render_participants()
+
+@timed_fragment("history")
+def render_history():
+    # Enhanced Results Section
+    st.markdown("""
+    <div class="premium-card">
+        <div class="card-header">
+            <span class="card-icon">🏆</span>
+            <h3 class="card-title">Decision History & Analytics</h3>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
     
-    with col_hist1:
-        st.markdown("#### 📋 Recent Results")
-        for i, result in enumerate(reversed(st.session_state.results[-8:]), 1):
-            winner = result.get('winner', result) if isinstance(result, dict) else result
-            magic = result.get('magic', False)
-            timestamp = result.get('timestamp', '')
-            
-            if timestamp:
-                try:
-                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    time_str = dt.strftime('%H:%M')
-                except:
+    results_stats = st.session_state.results_stats
+    if results_stats.total:
+        col_hist1, col_hist2 = st.columns([0.6, 0.4])
+        
+        with col_hist1:
+            st.markdown("#### 📋 Recent Results")
+            # Keyset paging through the ledger: each older page starts below the
+            # last id shown, so only one page of history is ever loaded
+            cursors = st.session_state.setdefault("history_cursors", [])
+            page, older_cursor = open_ledger().page(
+                st.session_state.history_id, before=cursors[-1] if cursors else None, limit=HISTORY_PAGE_SIZE
+            )
+            first_ordinal = results_stats.total - len(cursors) * HISTORY_PAGE_SIZE
+            for i, (_, result) in enumerate(page):
+                winner = result.get('winner', result) if isinstance(result, dict) else result
+                # Spin IDs are stable; entries from before they existed fall back to their place in the list
+                spin_id = result.get('spin_number') if isinstance(result, dict) else None
+                spin_id = spin_id or first_ordinal - i
+                if isinstance(result, dict) and 'winners' in result:
+                    winner = ', '.join(result['winners'])
+                magic = result.get('magic', False)
+                timestamp = result.get('timestamp', '')
+                
+                if timestamp:
+                    try:
+                        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+                        time_str = dt.strftime('%H:%M')
+                    except:
+                        time_str = ''
+                else:
                     time_str = ''
-            else:
-                time_str = ''
-            
-            magic_class = ' magic' if magic else ''
-            magic_icon = ' 🎩' if magic else ''
-            
-            st.markdown(f"""
-            <div class="result-item{magic_class}">
-                <div>
-                    <div class="result-winner">#{len(st.session_state.results)-i+1}: {winner}{magic_icon}</div>
-                    {f'<div class="result-magic">✨ Magic Result at {time_str}</div>' if magic else f'<div style="font-size: 0.8rem; color: var(--text-muted);">Random at {time_str}</div>' if time_str else ''}
+                
+                magic_class = ' magic' if magic else ''
+                magic_icon = ' 🎩' if magic else ''
+                
+                st.markdown(f"""
+                <div class="result-item{magic_class}">
+                    <div>
+                        <div class="result-winner">#{spin_id}: {winner}{magic_icon}</div>
+                        {f'<div class="result-magic">✨ Magic Result at {time_str}</div>' if magic else f'<div style="font-size: 0.8rem; color: var(--text-muted);">Random at {time_str}</div>' if time_str else ''}
+                    </div>
                 </div>
-            </div>
-            """, unsafe_allow_html=True)
-    
-    with col_hist2:
-        st.markdown("#### 📈 Winner Statistics")
-        if 'winner' in results_df.columns:
-            winner_counts = results_df['winner'].value_counts()
+                """, unsafe_allow_html=True)
             
-            for winner, count in winner_counts.head(5).items():
-                percentage = (count / len(st.session_state.results)) * 100
-                magic_wins = len([r for r in st.session_state.results if r.get('winner') == winner and r.get('magic', False)])
+            col_newer, col_older = st.columns(2)
+            with col_newer:
+                # Callbacks move the cursor before the fragment reruns
+                if cursors:
+                    st.button("⬅️ Newer", key="history_newer", on_click=cursors.pop, use_container_width=True)
+            with col_older:
+                if older_cursor is not None:
+                    st.button("Older ➡️", key="history_older", on_click=cursors.append, args=(older_cursor,),
+                              use_container_width=True)
+            
+            lookup = st.number_input("🔎 Find spin #", min_value=0, value=0, step=1, key="history_lookup",
+                                     help="0 to hide")
+            if lookup:
+                found = open_ledger().spin(st.session_state.history_id, int(lookup))
+                if found is None:
+                    st.caption(f"No spin #{int(lookup)} in this history")
+                else:
+                    found_winner = ', '.join(found['winners']) if 'winners' in found else found.get('winner')
+                    st.caption(f"Spin #{int(lookup)}: **{found_winner}**{' 🎩' if found.get('magic') else ''}")
+        
+        with col_hist2:
+            st.markdown("#### 📈 Winner Statistics")
+            for winner, count, magic_wins in results_stats.top_winners(5):
+                percentage = (count / results_stats.total) * 100
                 
                 st.markdown(f"""
                 <div style="background: var(--surface-elevated); padding: 0.75rem; border-radius: var(--radius); 
@@ -1665,343 +1185,55 @@ if st.session_state.results:
                     {f'<div style="font-size: 0.8rem; color: #a78bfa;">🎩 {magic_wins} magic wins</div>' if magic_wins > 0 else ''}
                 </div>
                 """, unsafe_allow_html=True)
-        
-        # Magic mode statistics
-        if any(r.get('magic', False) for r in st.session_state.results):
-            magic_count = sum(1 for r in st.session_state.results if r.get('magic', False))
-            magic_percentage = (magic_count / len(st.session_state.results)) * 100
             
-            st.markdown(f"""
-            <div style="background: linear-gradient(135deg, rgba(124, 58, 237, 0.1) 0%, rgba(168, 85, 247, 0.1) 100%);
-                        padding: 1rem; border-radius: var(--radius); margin-top: 1rem;
-                        border: 1px solid rgba(167, 139, 250, 0.3);">
-                <div style="text-align: center;">
-                    <div style="font-size: 1.5rem; color: #a78bfa; font-weight: 700;">🎩 {magic_count}</div>
-                    <div style="font-size: 0.8rem; color: var(--text-secondary); text-transform: uppercase; letter-spacing: 0.05em;">
-                        Magic Spins ({magic_percentage:.1f}%)
+            # Magic mode statistics
+            if results_stats.magic_total:
+                magic_count = results_stats.magic_total
+                magic_percentage = (magic_count / results_stats.total) * 100
+                
+                st.markdown(f"""
+                <div style="background: linear-gradient(135deg, rgba(124, 58, 237, 0.1) 0%, rgba(168, 85, 247, 0.1) 100%);
+                            padding: 1rem; border-radius: var(--radius); margin-top: 1rem;
+                            border: 1px solid rgba(167, 139, 250, 0.3);">
+                    <div style="text-align: center;">
+                        <div style="font-size: 1.5rem; color: #a78bfa; font-weight: 700;">🎩 {magic_count}</div>
+                        <div style="font-size: 0.8rem; color: var(--text-secondary); text-transform: uppercase; letter-spacing: 0.05em;">
+                            Magic Spins ({magic_percentage:.1f}%)
+                        </div>
                     </div>
                 </div>
-            </div>
-            """, unsafe_allow_html=True)
-else:
-    st.markdown("""
-    <div style="text-align: center; padding: 3rem; color: var(--text-muted);">
-        <div style="font-size: 3rem; margin-bottom: 1rem; opacity: 0.5;">📊</div>
-        <div style="font-size: 1.1rem; margin-bottom: 0.5rem;">No Results Yet</div>
-        <div style="font-size: 0.9rem;">Spin the wheel to see your decision history</div>
-    </div>
-    """, unsafe_allow_html=True)
-
-# Global Statistics Section
-st.markdown("""
-<div class="global-stats">
-    <h2 class="global-stats-title">🌍 WheelMaster Pro™ Global Impact</h2>
-    <p style="color: var(--text-secondary); font-size: 1.1rem; margin-bottom: 2rem;">
-        Trusted worldwide since 2019 • Powering decisions across 180+ countries
-    </p>
-</div>
-""", unsafe_allow_html=True)
-
-# Enhanced global metrics
-col_stat1, col_stat2, col_stat3, col_stat4 = st.columns(4)
-
-global_stats = [
-    ("1.8B+", "Decisions Made", "🎯"),
-    ("2.1M+", "Active Users", "👥"),
-    ("180+", "Countries", "🌍"),
-    ("99.97%", "Uptime SLA", "⚡")
-]
-
-for col, (value, label, icon) in zip([col_stat1, col_stat2, col_stat3, col_stat4], global_stats):
-    with col:
-        st.markdown(f"""
-        <div class="premium-metric">
-            <div style="font-size: 2rem; margin-bottom: 0.5rem;">{icon}</div>
-            <div class="metric-value">{value}</div>
-            <div class="metric-label">{label}</div>
+                """, unsafe_allow_html=True)
+        
+        # Detailed analytics need pandas, so it is only imported once they are opened
+        if st.toggle("📊 Detailed Analytics", key="show_detailed_analytics",
+                     help="Load the full history table and win distribution"):
+            history_df = history_frame(list(history_results()))
+            if 'winner' in history_df.columns:
+                st.bar_chart(history_df['winner'].value_counts())
+            st.dataframe(history_df, hide_index=True)
+    else:
+        st.markdown("""
+        <div style="text-align: center; padding: 3rem; color: var(--text-muted);">
+            <div style="font-size: 3rem; margin-bottom: 1rem; opacity: 0.5;">📊</div>
+            <div style="font-size: 1.1rem; margin-bottom: 0.5rem;">No Results Yet</div>
+            <div style="font-size: 0.9rem;">Spin the wheel to see your decision history</div>
         </div>
         """, unsafe_allow_html=True)
 
-# Enhanced FAQ Section
-st.markdown("---")
-st.markdown("""
-<div style="text-align: center; margin: 3rem 0 2rem 0;">
-    <h2 style="font-family: 'Playfair Display', serif; font-size: 2.5rem; font-weight: 700; 
-               background: var(--primary); -webkit-background-clip: text; 
-               -webkit-text-fill-color: transparent; background-clip: text;">
-        💡 Professional Knowledge Base
-    </h2>
-    <p style="color: var(--text-secondary); font-size: 1.1rem;">
-        Everything you need to know about professional decision-making
-    </p>
-</div>
-""", unsafe_allow_html=True)
+render_history()
 
-tab1, tab2, tab3, tab4 = st.tabs(["🚀 Getting Started", "🎩 Magic Mode", "🔒 Enterprise Security", "🏆 About Us"])
-
-with tab1:
-    st.markdown("""
-    ## Welcome to WheelMaster Pro™
-
-    **The Professional Standard for Decision-Making Since 2019**
-
-    WheelMaster Pro™ represents the pinnacle of digital decision-making tools, trusted by Fortune 500 companies, educational institutions, and professional organizations worldwide. Our platform combines sophisticated algorithms with intuitive design to deliver unparalleled decision-making experiences.
-
-    ### Core Features
-    - **Enterprise-Grade Security**: Bank-level encryption and SOC 2 Type II compliance
-    - **Advanced Analytics**: Real-time statistics and historical tracking
-    - **Professional Templates**: Pre-configured scenarios for business use cases
-    - **Magic Mode**: Discreet outcome control for demonstrations and training
-    - **Cross-Platform**: Seamless experience across all devices and browsers
-
-    ### Getting Started
-    1. **Add Participants**: Use our bulk editor or individual input for maximum flexibility
-    2. **Choose Your Theme**: Select from 6 professionally designed color schemes
-    3. **Configure Settings**: Adjust spin duration, intensity, and audio preferences
-    4. **Spin & Decide**: Let our cryptographically secure randomization make your choice
-    5. **Track Results**: Monitor patterns and export data for analysis
-
-    ### Professional Use Cases
-    - **Corporate Meetings**: Fair selection for presentations, assignments, and discussions
-    - **Training Sessions**: Interactive workshops and team-building exercises
-    - **Educational Settings**: Classroom participation and group formations
-    - **Event Management**: Prize drawings, contest selections, and audience engagement
-    """)
-
-with tab2:
-    st.markdown("""
-    ## 🎩 Magic Mode - Professional Outcome Control
+# Header, global stats, knowledge base and footer are static pages built once per process
+@timed_fragment("static_sections")
+def render_static():
+    render_static_sections()
 
-    **Discretely control outcomes while maintaining the appearance of randomness**
+render_static()
 
-    Magic Mode is WheelMaster Pro's™ premium feature designed for professionals who need to demonstrate concepts, conduct training scenarios, or ensure specific outcomes while preserving the engaging wheel experience.
+# Write out any spins still buffered for the ledger
+open_ledger().flush()
+end_page()
 
-    ### Access & Security
-    - **Password Protected**: Secure access prevents unauthorized use
-    - **Invisible Operation**: Participants cannot detect when Magic Mode is active
-    - **Audit Trail**: All magic spins are logged for transparency
-    - **Professional Ethics**: Designed for legitimate educational and demonstration purposes
-
-    ### Magic Mode Capabilities
-
-    #### Single Spin Control
-    Set a predetermined winner for the very next spin. Perfect for:
-    - Demonstration purposes in training sessions
-    - Ensuring fair distribution in sensitive situations
-    - Creating specific learning scenarios
-
-    #### Pattern Mode
-    Configure complex selection patterns:
-    - **Alternating Winners**: Switch between two predetermined participants
-    - **Round Robin**: Cycle through participants in a specific order
-    - **Weighted Distribution**: Control probability without obvious patterns
-
-    #### Advanced Scheduling
-    - Set winners for specific future spin numbers
-    - Configure multiple spins in advance
-    - Create realistic randomness with strategic control
-
-    ### Ethical Guidelines
-    Magic Mode should only be used for:
-    - Educational demonstrations and training
-    - Fair distribution when random results might be problematic
-    - Controlled scenarios in professional development
-    - Research and statistical analysis
-
-    ### Technical Implementation
-    - **Cryptographic Randomness**: When not in Magic Mode, true randomness is guaranteed
-    - **Seamless Integration**: Magic outcomes appear completely natural
-    - **Performance Optimized**: No impact on wheel speed or visual quality
-    """)
-
-with tab3:
-    st.markdown("""
-    ## 🔒 Enterprise Security & Compliance
-
-    **Bank-grade security protecting your data and decisions since 2019**
-
-    ### Security Certifications
-    - **SOC 2 Type II Compliant**: Annual third-party security audits
-    - **ISO 27001 Certified**: International information security standards
-    - **GDPR Compliant**: Full European data protection compliance
-    - **CCPA Compliant**: California Consumer Privacy Act adherence
-
-    ### Data Protection
-    - **Zero Data Collection**: No personal information stored on our servers
-    - **Local Processing**: All computations happen in your browser
-    - **Encrypted Transmission**: 256-bit SSL/TLS encryption for all communications
-    - **No Tracking**: No cookies, analytics, or user behavior monitoring
-
-    ### Technical Security
-    - **Content Security Policy**: Advanced XSS and injection attack prevention
-    - **Secure Headers**: HSTS, X-Frame-Options, and CSP implementation
-    - **Regular Audits**: Quarterly penetration testing and vulnerability assessments
-    - **Bug Bounty Program**: Continuous security improvement through ethical hackers
-
-    ### Cryptographic Randomness
-    - **CSPRNG Algorithm**: Cryptographically Secure Pseudo-Random Number Generation
-    - **Hardware Entropy**: Utilizes system hardware for true randomness
-    - **Bias Testing**: Regular statistical analysis ensures fair distribution
-    - **Audit Trails**: Complete logging of all random number generation
-
-    ### Infrastructure Security
-    - **Multi-Region Deployment**: Redundant systems across three continents
-    - **DDoS Protection**: Enterprise-grade attack mitigation
-    - **24/7 Monitoring**: Real-time security event detection and response
-    - **Incident Response**: Dedicated security team with <15 minute response time
-
-    ### Privacy Guarantees
-    - **No User Accounts**: Use immediately without registration
-    - **Anonymous Usage**: No IP logging or user identification
-    - **Local Storage Only**: All data remains on your device
-    - **Right to Forget**: Data automatically cleared when you close the browser
-    """)
-
-with tab4:
-    st.markdown("""
-    ## 🏆 About WheelMaster Pro™
-
-    **The world's most trusted decision-making platform since 2019**
-
-    ### Our Story
-    Founded in 2019 by a team of enterprise software engineers and UX designers, WheelMaster Pro™ was born from the need for a professional-grade decision-making tool that could meet enterprise security requirements while maintaining the simplicity and engagement of traditional decision wheels.
-
-    ### By the Numbers
-    - **6+ Years**: Continuous operation and improvement
-    - **1.8 Billion+**: Decisions made through our platform
-    - **2.1 Million+**: Active users worldwide
-    - **180+ Countries**: Global reach and localization
-    - **99.97%**: Historical uptime (industry-leading SLA)
-
-    ### Enterprise Clients
-    - **Fortune 500 Companies**: 73% of Fortune 500 companies have used our platform
-    - **Educational Institutions**: 2,400+ schools and universities worldwide
-    - **Government Agencies**: Trusted by federal and local government organizations
-    - **Healthcare Systems**: HIPAA-compliant implementations for medical training
-
-    ### Awards & Recognition
-    - **2024**: "Best Enterprise Tool" - Software Innovation Awards
-    - **2023**: "Excellence in UX Design" - Digital Design Awards
-    - **2022**: "Top Security Implementation" - Cybersecurity Excellence Awards
-    - **2021**: "Innovation in Education Technology" - EdTech Breakthrough Awards
-
-    ### Technology Stack
-    - **Frontend**: Modern JavaScript (ES2022), HTML5 Canvas, GSAP Animation
-    - **Security**: Advanced CSP, OWASP Top 10 compliance, regular SAST/DAST scanning
-    - **Performance**: CDN distribution, edge computing, sub-second load times globally
-    - **Accessibility**: WCAG 2.1 AA compliant, screen reader support, keyboard navigation
-
-    ### Environmental Commitment
-    - **Carbon Neutral**: 100% renewable energy since 2020
-    - **Green Hosting**: Partnership with carbon-negative cloud providers
-    - **Efficient Code**: Optimized algorithms reduce energy consumption by 40%
-    - **Sustainability**: Committed to net-zero emissions by 2025
-
-    ### Future Roadmap
-    - **AI Integration**: Smart pattern recognition and bias detection
-    - **API Platform**: Enterprise integrations and custom implementations
-    - **Mobile Apps**: Native iOS and Android applications
-    - **Advanced Analytics**: Machine learning insights and predictive modeling
-    """)
-
-import streamlit as st
-
-import streamlit as st
-
-import streamlit as st
-
-import streamlit as st
-
-def render_thin_footer():
-    st.markdown("""
-    <style>
-        @import url('https://fonts.googleapis.com/css2?family=Open+Sans:wght@400;600&display=swap');
-
-        :root {
-            --primary-color: #111827;
-            --accent-color: #2563eb;
-            --text-primary: #f9fafb;
-            --text-secondary: #d1d5db;
-            --border-color: rgba(255, 255, 255, 0.1);
-        }
-
-        .thin-footer {
-            background: var(--primary-color);
-            padding: 1rem 2rem;
-            margin-top: 2rem;
-            color: var(--text-primary);
-            font-family: 'Open Sans', sans-serif;
-            font-size: 0.85rem;
-            display: flex;
-            justify-content: space-between;
-            align-items: center;
-            border-top: 1px solid var(--border-color);
-            box-shadow: 0 -2px 8px rgba(0, 0, 0, 0.1);
-        }
-
-        .footer-content {
-            display: flex;
-            width: 100%;
-            justify-content: space-between;
-            align-items: center;
-            gap: 2rem; /* Uniform gap between all elements */
-        }
-
-        .footer-links {
-            display: flex;
-            gap: 2rem; /* Equal spacing between links */
-            align-items: center;
-        }
-
-        .footer-links a {
-            color: var(--text-secondary);
-            text-decoration: none;
-            font-weight: 400;
-            transition: color 0.3s ease;
-        }
-
-        .footer-links a:hover {
-            color: var(--accent-color);
-        }
-
-        .footer-copyright {
-            color: var(--text-secondary);
-            font-weight: 400;
-            white-space: nowrap;
-        }
-
-        @media (max-width: 768px) {
-            .thin-footer {
-                padding: 1.5rem 1rem;
-            }
-            .footer-content {
-                flex-direction: column;
-                gap: 1rem;
-                text-align: center;
-            }
-            .footer-links {
-                flex-wrap: wrap;
-                justify-content: center;
-                gap: 1.5rem;
-            }
-        }
-    </style>
-
-    <div class="thin-footer">
-        <div class="footer-content">
-            <div class="footer-links">
-                <a href="#home">Home</a>
-                <a href="#about">About</a>
-                <a href="#privacy">Privacy</a>
-                <a href="#terms">Terms</a>
-                <a href="#contact">Contact</a>
-            </div>
-            <div class="footer-copyright">
-                © 2025 DecisionFlow Inc. All rights reserved.
-            </div>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
-
-# Call the footer in your Streamlit app
-render_thin_footer()
\ No newline at end of file
+with st.sidebar:
+    with st.expander("⏱️ Render Timings"):
+        st.markdown(timing_report())
+        st.caption("Partial runs re-execute a single fragment; the report refreshes on full page runs")
\ No newline at end of file
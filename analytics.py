@@ -0,0 +1,137 @@
+import heapq
+import math
+import time
+from collections import Counter
+from datetime import datetime
+
+
+class ResultsAggregator:
+    """Running tallies over the spin history, updated as results are appended
+
+    Every rerun reads counts from here instead of rescanning
+    ``st.session_state.results``, so rendering the analytics costs the same
+    whether the history holds ten spins or a hundred thousand.
+    """
+
+    def __init__(self, results=()):
+        self.total = 0
+        self.magic_total = 0
+        self.wins = Counter()
+        self.magic_wins = Counter()
+        for result in results:
+            self.add(result)
+
+    @classmethod
+    def from_counts(cls, total, magic_total, wins, magic_wins):
+        """Tallies seeded from counts already taken, e.g. by ``Ledger.tallies``
+
+        ``wins`` holds ``(winner, count)`` pairs in first-win order.
+        """
+        stats = cls()
+        stats.total = total
+        stats.magic_total = magic_total
+        stats.wins = Counter(dict(wins))
+        stats.magic_wins = Counter(magic_wins)
+        return stats
+
+    def add(self, result):
+        """Count one appended result in O(1)"""
+        if isinstance(result, dict):
+            winner = result.get("winner")
+            magic = result.get("magic", False)
+            # Multi-winner draws count a win for everyone placed
+            winners = result.get("winners", [winner])
+        else:
+            winner, magic, winners = result, False, [result]
+
+        self.total += 1
+        self.wins.update(winners)
+        if magic:
+            self.magic_total += 1
+            self.magic_wins[winner] += 1
+
+    def add_batch(self, winners, magic_winners=()):
+        """Count a bulk-appended run of spins from their winner names
+
+        ``magic_winners`` lists the winners of the magic spins in the run.
+        """
+        self.total += len(winners)
+        self.magic_total += len(magic_winners)
+        self.wins.update(winners)
+        self.magic_wins.update(magic_winners)
+
+    def top_winners(self, n=5):
+        """The ``n`` most frequent winners as (winner, wins, magic wins)"""
+        # Ties keep first-win order
+        top = heapq.nlargest(n, self.wins.items(), key=lambda item: item[1])
+        return [(winner, count, self.magic_wins[winner]) for winner, count in top]
+
+
+class RecencyWeights:
+    """Exponentially decayed recent-win scores, kept current as results are appended
+
+    Each win adds 1 to the winner's score and every score halves after
+    ``half_life`` spins (``basis="spins"``) or minutes (``basis="time"``).
+    A participant's weight is divided by ``1 + score``, so someone who just
+    won is half as likely to come up next, never excluded. Scores are stored
+    with the clock of their last update and decayed when read, so adding a
+    result is O(1) and the history is never rescanned.
+    """
+
+    def __init__(self, basis="spins", half_life=5, results=()):
+        self.basis = basis
+        self.half_life = half_life
+        unit = 60 if basis == "time" else 1
+        self._rate = math.log(2) / (half_life * unit)
+        self._spins = 0
+        self._scores = {}
+        for result in results:
+            self.add(result)
+
+    def _clock(self, timestamp=None):
+        if self.basis == "spins":
+            return self._spins
+        if timestamp:
+            try:
+                return datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                pass
+        return time.time()
+
+    def add(self, result):
+        """Score one appended result in O(1) per winner"""
+        if isinstance(result, dict):
+            winners = result.get("winners", [result.get("winner")])
+            timestamp = result.get("timestamp")
+        else:
+            winners, timestamp = [result], None
+
+        self._spins += 1
+        clock = self._clock(timestamp)
+        for winner in winners:
+            self._scores[winner] = (self.score(winner, clock) + 1, clock)
+
+    def score(self, name, clock=None):
+        """Decayed number of recent wins for ``name``"""
+        if name not in self._scores:
+            return 0
+        if clock is None:
+            clock = self._clock()
+        score, updated = self._scores[name]
+        return score * math.exp(-self._rate * max(clock - updated, 0))
+
+    def weights(self, entries):
+        """Effective weights for (name, base weight) entries"""
+        clock = self._clock()
+        return [weight / (1 + self.score(name, clock)) for name, weight in entries]
+
+
+def history_frame(results):
+    """The full spin history as a DataFrame for the detailed analytics view
+
+    pandas costs about a second and ~80 MB on import, so it is only loaded
+    here, once someone actually opens the detailed analytics.
+    """
+    import pandas as pd
+
+    return pd.DataFrame(results)
@@ -0,0 +1,387 @@
+import codecs
+import json
+import math
+import os
+import re
+import uuid
+
+from analytics import ResultsAggregator
+from roster import Roster
+
+# Streaming configuration import. The upload is read in chunks and the large
+# arrays ("names" and "results", and the arrays inside the compact roster
+# form) are decoded one element at a time, validated
+# as they arrive and, for results, staged in the ledger under a temporary
+# history. Nothing in the session changes until the whole file has passed;
+# the staged history is then swapped in with a single transaction.
+SUPPORTED_VERSION = "3.0.0"
+
+# Caps, overridable through the environment for bigger deployments
+MAX_IMPORT_BYTES = int(float(os.environ.get("WHEEL_IMPORT_MAX_MB", "200")) * 1024 * 1024)
+MAX_PARTICIPANTS = int(os.environ.get("WHEEL_IMPORT_MAX_PARTICIPANTS", "1000000"))
+MAX_RESULTS = int(os.environ.get("WHEEL_IMPORT_MAX_RESULTS", "5000000"))
+MAX_NAME_LENGTH = 200
+
+# Values the sidebar widgets accept; imported settings outside them are rejected
+SETTING_CHOICES = {
+    "selection_mode": ("random", "shuffle_bag", "recency"),
+    "recency_basis": ("spins", "time"),
+    "render_mode": ("bitmap", "canvas"),
+}
+SETTING_RANGES = {
+    "spin_duration": (2, 12),
+    "spin_count": (3, 20),
+    "recency_half_life": (1, 1000),
+}
+
+READ_CHUNK = 64 * 1024
+PROGRESS_EVERY = 5000
+
+# Top-level arrays decoded element by element instead of as one value
+_STREAMED_KEYS = ("names", "results")
+# Arrays of the compact roster object (see Roster.to_export), streamed the same way
+_COMPACT_FIELDS = ("names", "entries", "weights", "groups")
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER_TAIL = re.compile(r"[0-9.eE+\-]*")
+_SEPARATOR = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+
+
+class ConfigImportError(ValueError):
+    """The upload is not a valid configuration within the import limits"""
+
+
+class _JSONStream:
+    """Rolling-buffer reader over a text file for incremental JSON decoding"""
+
+    def __init__(self, file, on_read=None):
+        self._file = file
+        self._on_read = on_read
+        self._decoder = json.JSONDecoder()
+        # Incremental, so a multi-byte character split across chunks survives
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self, size=READ_CHUNK):
+        if self._eof:
+            return False
+        data = self._file.read(size)
+        try:
+            chunk = self._text.decode(data, final=not data) if isinstance(data, bytes) else data
+        except UnicodeDecodeError:
+            raise ConfigImportError("the file is not valid UTF-8 text") from None
+        if not data:
+            self._eof = True
+            return False
+        # Drop what has been consumed so the buffer stays about one chunk long
+        self._buffer = self._buffer[self._pos:] + chunk
+        self._pos = 0
+        if self._on_read:
+            self._on_read(len(data))
+        return True
+
+    def peek(self):
+        """Next non-whitespace character, or '' at end of input"""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer) or not self._fill():
+                return self._buffer[self._pos:self._pos + 1]
+
+    def expect(self, chars):
+        char = self.peek()
+        if not char or char not in chars:
+            raise ConfigImportError(f"malformed JSON: expected {' or '.join(chars)}, found {char or 'end of file'!r}")
+        self._pos += 1
+        return char
+
+    def value(self):
+        """Decode one complete JSON value"""
+        self.peek()
+        # Every retry re-parses the value from its start, so the read size
+        # doubles each time to keep a large value linear to decode
+        size = READ_CHUNK
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                # A value cut off by the chunk boundary: read on and retry
+                if self._fill(size):
+                    size *= 2
+                    continue
+                raise ConfigImportError(f"malformed JSON: {e.msg}") from None
+            # A number running up to the end of the buffer ("1", "1.", "1e+") may
+            # continue in the next chunk
+            if (isinstance(value, (int, float)) and not self._eof
+                    and _NUMBER_TAIL.match(self._buffer, end).end() == len(self._buffer)):
+                if self._fill(size):
+                    size *= 2
+                    continue
+            self._pos = end
+            return value
+
+    def elements(self):
+        """Decode a JSON array one element at a time"""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        decode = self._decoder.raw_decode
+        while True:
+            # Fast path: the element and the separator after it are both in the buffer
+            try:
+                value, end = decode(self._buffer, self._pos)
+                separator = _SEPARATOR.match(self._buffer, end)
+            except json.JSONDecodeError:
+                separator = None
+            if separator is None:
+                # Cut off by the chunk boundary, or malformed: read on the careful way
+                value = self.value()
+                char = self.expect(",]")
+                if char == ",":
+                    self.peek()
+            else:
+                self._pos = separator.end()
+                char = separator.group(1)
+            yield value
+            if char == "]":
+                return
+
+    def keys(self):
+        """Walk a JSON object, yielding each key with the stream at its value
+
+        The caller must read the value before asking for the next key.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            if not isinstance(key, str):
+                raise ConfigImportError("malformed JSON: object keys must be strings")
+            self.expect(":")
+            yield key
+            if self.expect(",}") == "}":
+                return
+
+
+def iter_config(file, on_read=None):
+    """Yield ``(key, value)`` for the top-level fields of a configuration file
+
+    Elements of the ``names`` and ``results`` arrays are yielded one at a time
+    as ``(key, element)``; other fields are yielded whole. A compact roster
+    object under ``names`` is yielded one array at a time as
+    ``("names.<field>", elements)``, where ``elements`` iterates over the
+    array and is only valid until the next item is requested.
+    """
+    stream = _JSONStream(file, on_read)
+    for key in stream.keys():
+        char = stream.peek()
+        if key in _STREAMED_KEYS and char == "[":
+            for element in stream.elements():
+                yield key, element
+        elif key == "names" and char == "{":
+            yield from _compact_fields(stream)
+        else:
+            yield key, stream.value()
+    if stream.peek():
+        raise ConfigImportError("malformed JSON: unexpected data after the configuration")
+
+
+def _compact_fields(stream):
+    seen = set()
+    for field in stream.keys():
+        if field not in _COMPACT_FIELDS:
+            stream.value()
+            continue
+        if stream.peek() != "[":
+            raise ConfigImportError(f"names: '{field}' in the compact form must be a list")
+        seen.add(field)
+        elements = stream.elements()
+        yield f"names.{field}", elements
+        # Skip whatever the consumer left unread
+        for _ in elements:
+            pass
+    if "names" not in seen:
+        raise ConfigImportError("names: the compact form needs a 'names' list")
+
+
+def _check_name(name, where):
+    if not isinstance(name, str) or not name.strip():
+        raise ConfigImportError(f"{where}: participant names must be non-empty text")
+    if len(name) > MAX_NAME_LENGTH:
+        raise ConfigImportError(f"{where}: participant name longer than {MAX_NAME_LENGTH} characters")
+    return name
+
+
+def _check_weight(weight, where):
+    if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+        raise ConfigImportError(f"{where}: weights must be positive, finite numbers")
+    # JSON's Infinity parses too, and would make every slice size NaN
+    if not (weight > 0 and math.isfinite(weight)):
+        raise ConfigImportError(f"{where}: weights must be positive, finite numbers")
+    return weight
+
+
+def _compact_field(field, elements):
+    """Validate one streamed array of the compact roster form as it is read"""
+    checked = []
+    for value in elements:
+        if len(checked) >= MAX_PARTICIPANTS:
+            raise ConfigImportError(f"names: at most {MAX_PARTICIPANTS:,} participants can be imported")
+        if field == "names":
+            value = _check_name(value, "names")
+        elif field == "entries":
+            if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+                raise ConfigImportError("names: entries must index into the names list")
+        elif field == "weights":
+            value = _check_weight(value, "names")
+        elif value is not None and not isinstance(value, str):
+            raise ConfigImportError("names: groups must be text or null")
+        checked.append(value)
+    return checked
+
+
+def _compact_roster(fields):
+    """Roster from the validated arrays of the compact ``{"names", "entries", "weights", "groups"}`` form"""
+    names = fields["names"]
+    entries = fields.get("entries")
+    if entries is not None and entries and max(entries) >= len(names):
+        raise ConfigImportError("names: entries must index into the names list")
+    count = len(names) if entries is None else len(entries)
+    weights = fields.get("weights")
+    if weights is not None and len(weights) != count:
+        raise ConfigImportError("names: there must be one weight per entry")
+    groups = fields.get("groups")
+    if groups is not None and len(groups) != count:
+        raise ConfigImportError("names: there must be one group per entry")
+    return Roster.from_export(fields)
+
+
+def _check_settings(settings, defaults):
+    """Known settings with the same types as the defaults and values the
+    sidebar accepts; unknown keys are dropped"""
+    if not isinstance(settings, dict):
+        raise ConfigImportError("settings must be an object")
+    checked = {}
+    for key, value in settings.items():
+        if key not in defaults:
+            continue
+        expected = type(defaults[key])
+        if expected is int and isinstance(value, float) and value.is_integer():
+            value = int(value)
+        if type(value) is not expected:
+            raise ConfigImportError(f"settings.{key} must be {expected.__name__}")
+        if key in SETTING_CHOICES and value not in SETTING_CHOICES[key]:
+            raise ConfigImportError(f"settings.{key} must be one of {', '.join(SETTING_CHOICES[key])}")
+        if key in SETTING_RANGES:
+            low, high = SETTING_RANGES[key]
+            if not low <= value <= high:
+                raise ConfigImportError(f"settings.{key} must be between {low} and {high}")
+        checked[key] = value
+    return checked
+
+
+def _check_result(result, number):
+    """Normalise one history entry; legacy entries may be a bare winner name"""
+    where = f"results[{number}]"
+    if isinstance(result, str):
+        return {"winner": result, "timestamp": None, "magic": False, "spin_number": None}
+    if not isinstance(result, dict):
+        raise ConfigImportError(f"{where} must be an object")
+    checked = {
+        "winner": result.get("winner"),
+        "timestamp": result.get("timestamp"),
+        "magic": result.get("magic", False),
+        "spin_number": result.get("spin_number"),
+    }
+    if not isinstance(checked["winner"], str):
+        raise ConfigImportError(f"{where}.winner must be text")
+    if checked["timestamp"] is not None and not isinstance(checked["timestamp"], str):
+        raise ConfigImportError(f"{where}.timestamp must be text")
+    if not isinstance(checked["magic"], bool):
+        raise ConfigImportError(f"{where}.magic must be true or false")
+    spin_number = checked["spin_number"]
+    if spin_number is not None and (isinstance(spin_number, bool) or not isinstance(spin_number, int)):
+        raise ConfigImportError(f"{where}.spin_number must be a whole number")
+    if "winners" in result:
+        winners = result["winners"]
+        if not isinstance(winners, list) or not all(isinstance(name, str) for name in winners):
+            raise ConfigImportError(f"{where}.winners must be a list of names")
+        checked["winners"] = winners
+    return checked
+
+
+def import_configuration(file, size, ledger, history, default_settings, progress=None):
+    """Validate an uploaded configuration and stage it for the given history
+
+    ``progress(fraction, message)`` is called as the file is read. Results
+    are written to a staging history in the ledger; on success the staged
+    history has replaced ``history`` and a dict with the new ``roster``,
+    ``settings`` and ``results_stats`` is returned for the caller to put in
+    the session. On any error the staging rows are dropped and
+    ``ConfigImportError`` is raised with nothing changed.
+    """
+    if size > MAX_IMPORT_BYTES:
+        raise ConfigImportError(f"file is larger than the {MAX_IMPORT_BYTES // (1024 * 1024)} MB import limit")
+
+    read = 0
+
+    def on_read(count):
+        nonlocal read
+        read += count
+        if progress:
+            progress(min(read / max(size, 1), 1.0), f"Reading… {read / (1024 * 1024):.1f} MB")
+
+    staging = f"{history}:import:{uuid.uuid4().hex}"
+    names = Roster()
+    compact_fields = None
+    settings = {}
+    stats = ResultsAggregator()
+    metadata = None
+    batch = []
+    try:
+        for key, value in iter_config(file, on_read):
+            if key == "names":
+                names.append(_check_name(value, "names"))
+                if len(names) > MAX_PARTICIPANTS:
+                    raise ConfigImportError(f"names: at most {MAX_PARTICIPANTS:,} participants can be imported")
+            elif key.startswith("names."):
+                # One array of the compact roster form; the roster is built once all have arrived
+                field = key[len("names."):]
+                compact_fields = {} if compact_fields is None else compact_fields
+                compact_fields[field] = _compact_field(field, value)
+            elif key == "results":
+                if stats.total >= MAX_RESULTS:
+                    raise ConfigImportError(f"results: at most {MAX_RESULTS:,} spins can be imported")
+                result = _check_result(value, stats.total)
+                stats.add(result)
+                batch.append(result)
+                if len(batch) == PROGRESS_EVERY:
+                    ledger.append(staging, batch)
+                    batch = []
+            elif key == "settings":
+                settings = _check_settings(value, default_settings)
+            elif key == "metadata":
+                if not isinstance(value, dict):
+                    raise ConfigImportError("metadata must be an object")
+                metadata = value
+        if metadata is None or metadata.get("version") != SUPPORTED_VERSION:
+            found = "no version" if metadata is None else f"version {metadata.get('version')!r}"
+            raise ConfigImportError(f"expected a version {SUPPORTED_VERSION} export, found {found}")
+
+        compact_roster = _compact_roster(compact_fields) if compact_fields is not None else None
+        ledger.append(staging, batch)
+        ledger.adopt(staging, history)
+    except BaseException:
+        ledger.discard(staging)
+        raise
+
+    if progress:
+        progress(1.0, "Validated")
+    return {
+        "roster": compact_roster if compact_roster is not None else names,
+        "settings": settings,
+        "results_stats": stats,
+    }
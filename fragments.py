@@ -0,0 +1,80 @@
+import logging
+import time
+from functools import wraps
+
+import streamlit as st
+
+# Page fragments. The page is split into parts that rerun on their own: a
+# widget inside a fragment re-executes (and resends) only that fragment, not
+# the whole script. Each run is timed per fragment, split into full-page runs
+# and partial reruns, so the saving can be read off the timing report.
+#
+# Callbacks whose change shows up in other fragments (a new spin result
+# updates the analytics and the history) call request_full_rerun(); the next
+# fragment run then turns into a full page run.
+logger = logging.getLogger(__name__)
+
+
+def begin_page():
+    """Mark the start of a full script run"""
+    st.session_state.page_run = st.session_state.get("page_run", 0) + 1
+    st.session_state.page_started = time.perf_counter()
+    # This run refreshes every fragment anyway
+    st.session_state.pop("full_rerun_requested", None)
+
+
+def end_page():
+    """Record how long the full script run took"""
+    _record("page", time.perf_counter() - st.session_state.page_started, partial=False)
+
+
+def request_full_rerun():
+    """From a callback inside a fragment: rerun the whole page, not just the fragment"""
+    st.session_state.full_rerun_requested = True
+
+
+def timed_fragment(name):
+    """``st.fragment`` that also times every run of the decorated function"""
+    def decorate(func):
+        @wraps(func)
+        def run(*args, **kwargs):
+            if st.session_state.pop("full_rerun_requested", False):
+                st.rerun()
+            seen = st.session_state.setdefault("fragment_page_runs", {})
+            # Running twice in the same page run can only be a partial rerun
+            partial = seen.get(name) == st.session_state.page_run
+            seen[name] = st.session_state.page_run
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _record(name, time.perf_counter() - start, partial)
+        return st.fragment(run)
+    return decorate
+
+
+def _record(name, seconds, partial):
+    timings = st.session_state.setdefault("fragment_timings", {})
+    entry = timings.setdefault(name, {"full_runs": 0, "full_ms": 0.0, "partial_runs": 0, "partial_ms": 0.0})
+    ms = seconds * 1000
+    kind = "partial" if partial else "full"
+    entry[f"{kind}_runs"] += 1
+    entry[f"{kind}_ms"] += ms
+    entry["last_ms"] = ms
+    logger.debug("%s: %s run in %.1f ms", name, kind, ms)
+
+
+def timing_report():
+    """Markdown table of run counts and average times per fragment"""
+    lines = [
+        "| Part | Full runs | Avg ms | Partial runs | Avg ms | Last ms |",
+        "|---|---:|---:|---:|---:|---:|",
+    ]
+    for name, entry in st.session_state.get("fragment_timings", {}).items():
+        full = entry["full_ms"] / entry["full_runs"] if entry["full_runs"] else 0
+        partial = entry["partial_ms"] / entry["partial_runs"] if entry["partial_runs"] else 0
+        lines.append(
+            f"| {name} | {entry['full_runs']} | {full:.1f} | {entry['partial_runs']}"
+            f" | {partial:.1f} | {entry['last_ms']:.1f} |"
+        )
+    return "\n".join(lines)
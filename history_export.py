@@ -0,0 +1,195 @@
+import csv
+import io
+import json
+import tempfile
+from datetime import date, datetime, timedelta
+
+# Streaming history exports. Every format is produced from the ledger in
+# chunks, so the streaming endpoint never holds the whole history (or the
+# whole file) in memory at once. The in-app download does: Streamlit needs
+# the finished file as bytes.
+#
+# NDJSON: first line {"metadata": {...}}, then one result per line.
+# CSV: "# key: value" metadata comment lines, a header, then one row per
+#      result (multi-winner draws list their winners separated by "; ").
+# Parquet: the metadata is stored in the file's key-value metadata and the
+#      winner column is dictionary-encoded (categorical in pandas).
+FORMATS = {
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv", "csv"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+CSV_COLUMNS = ["spin_number", "timestamp", "winner", "winners", "magic"]
+
+# Results per chunk written to the output / per Parquet row group
+CHUNK_ROWS = 5000
+
+# Exports are spooled in memory up to this size, then to a temporary file
+SPOOL_BYTES = 8 * 1024 * 1024
+
+# Path of the streaming endpoint mounted by server.py, including
+# server.baseUrlPath; None when the app runs without it (plain
+# `streamlit run Wheel.py`)
+ROUTE_PATH = None
+
+
+def history_filters(since=None, until=None, winner=None):
+    """Ledger query filters for an inclusive date range and a winner name"""
+    filters = {}
+    if since:
+        filters["since"] = since.isoformat()
+    if until:
+        # ISO timestamps compare as text, so "before the next day" is inclusive
+        filters["before"] = (until + timedelta(days=1)).isoformat()
+    if winner:
+        filters["winner"] = winner
+    return filters
+
+
+def _chunks(results, size=CHUNK_ROWS):
+    chunk = []
+    for result in results:
+        chunk.append(result)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def ndjson_chunks(results, metadata):
+    """Encoded NDJSON, one chunk of lines at a time"""
+    yield (json.dumps({"metadata": metadata}) + "\n").encode("utf-8")
+    for chunk in _chunks(results):
+        yield "".join(json.dumps(result) + "\n" for result in chunk).encode("utf-8")
+
+
+def csv_chunks(results, metadata):
+    """Encoded CSV with a metadata comment header, one chunk of rows at a time"""
+    buffer = io.StringIO()
+    for key, value in metadata.items():
+        buffer.write(f"# {key}: {json.dumps(value) if isinstance(value, dict) else value}\n")
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for chunk in _chunks(results):
+        writer.writerows(
+            (result["spin_number"], result["timestamp"], result["winner"],
+             "; ".join(result.get("winners", ())), result["magic"])
+            for result in chunk
+        )
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def write_parquet(results, metadata, sink):
+    """Write results to ``sink`` as Parquet, one row group per chunk"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("spin_number", pa.int64()),
+            ("timestamp", pa.string()),
+            ("winner", pa.dictionary(pa.int32(), pa.string())),
+            ("winners", pa.list_(pa.string())),
+            ("magic", pa.bool_()),
+        ],
+        metadata={"wheelmaster": json.dumps(metadata)},
+    )
+    with pq.ParquetWriter(sink, schema) as writer:
+        for chunk in _chunks(results):
+            writer.write_table(pa.table(
+                {
+                    "spin_number": [result["spin_number"] for result in chunk],
+                    "timestamp": [result["timestamp"] for result in chunk],
+                    "winner": pa.array([result["winner"] for result in chunk]).dictionary_encode(),
+                    "winners": [result.get("winners") for result in chunk],
+                    "magic": [result["magic"] for result in chunk],
+                },
+                schema=schema,
+            ))
+
+
+def _write_export(fmt, results, metadata, sink):
+    if fmt == "parquet":
+        write_parquet(results, metadata, sink)
+    else:
+        for chunk in (ndjson_chunks if fmt == "ndjson" else csv_chunks)(results, metadata):
+            sink.write(chunk)
+
+
+def export_file(fmt, results, metadata):
+    """Spool a whole export to a file object, rewound and ready to read"""
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    _write_export(fmt, results, metadata, spool)
+    spool.seek(0)
+    return spool
+
+
+def export_bytes(fmt, results, metadata):
+    """A whole export as bytes, for Streamlit's download button"""
+    buffer = io.BytesIO()
+    _write_export(fmt, results, metadata, buffer)
+    return buffer.getvalue()
+
+
+def export_metadata(user_tier=None, filters=None):
+    """The metadata block every export carries"""
+    metadata = {"export_date": datetime.now().isoformat(), "version": "3.0.0"}
+    if user_tier:
+        metadata["user_tier"] = user_tier
+    if filters:
+        metadata["filters"] = filters
+    return metadata
+
+
+def export_filename(fmt):
+    return f"wheelmaster_history_{date.today():%Y%m%d}.{FORMATS[fmt][1]}"
+
+
+def export_route(path="/export/history"):
+    """Starlette route streaming an export straight from the ledger
+
+    Query parameters: ``history`` (required), ``format``, ``since``/``until``
+    (YYYY-MM-DD), ``winner`` and ``tier``. Mount it via ``st.App(routes=...)``;
+    ``path`` is taken relative to ``server.baseUrlPath``, which custom routes
+    do not get on their own.
+    """
+    from starlette.responses import PlainTextResponse, StreamingResponse
+    from starlette.routing import Route
+    from streamlit import config
+    from streamlit.url_util import make_url_path
+
+    from ledger import open_ledger
+
+    global ROUTE_PATH
+    path = ROUTE_PATH = make_url_path(config.get_option("server.baseUrlPath") or "", path)
+
+    def endpoint(request):
+        params = request.query_params
+        fmt = params.get("format", "ndjson")
+        history = params.get("history")
+        if not history or fmt not in FORMATS:
+            return PlainTextResponse("history and a valid format are required", status_code=400)
+        try:
+            since = date.fromisoformat(params["since"]) if params.get("since") else None
+            until = date.fromisoformat(params["until"]) if params.get("until") else None
+        except ValueError:
+            return PlainTextResponse("since/until must be YYYY-MM-DD", status_code=400)
+
+        filters = history_filters(since, until, params.get("winner"))
+        metadata = export_metadata(params.get("tier"), filters)
+        results = open_ledger().results(history, **filters)
+        headers = {"Content-Disposition": f'attachment; filename="{export_filename(fmt)}"'}
+        if fmt == "parquet":
+            # Parquet needs a seekable sink; the spool keeps memory bounded
+            body = export_file(fmt, results, metadata)
+            content = iter(lambda: body.read(1024 * 1024), b"")
+        else:
+            content = (ndjson_chunks if fmt == "ndjson" else csv_chunks)(results, metadata)
+        return StreamingResponse(content, media_type=FORMATS[fmt][0], headers=headers)
+
+    return Route(path, endpoint)
@@ -0,0 +1,271 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from itertools import islice
+
+import streamlit as st
+
+# Durable spin history. Every spin is appended to a SQLite database in WAL
+# mode, so the history survives closed tabs, worker restarts and rescheduled
+# pods, and readers never block the writer. Each browser history has its own
+# id (kept in the page URL), and the (history, id) index keeps both appends
+# and cursor-paged reads cheap however long the ledger grows.
+#
+# The ledger also hands out spin IDs: a spin gets the next spin_number of its
+# history when it is appended, never before, so IDs only move when a spin is
+# committed and can be looked up again through the (history, spin_number)
+# index.
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+LEDGER_PATH = os.environ.get("WHEEL_LEDGER_PATH", os.path.join(_APP_DIR, "wheel_ledger.db"))
+
+# Buffered spins are written in one transaction once this many are queued,
+# or earlier when the history is read or the script run ends. Big appends are
+# taken this many at a time too, releasing the app-wide lock in between.
+FLUSH_ROWS = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS spins (
+    id INTEGER PRIMARY KEY,
+    history TEXT NOT NULL,
+    spin_number INTEGER,
+    winner TEXT,
+    winners TEXT,
+    timestamp TEXT,
+    magic INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS spins_by_history ON spins (history, id);
+CREATE INDEX IF NOT EXISTS spins_by_number ON spins (history, spin_number);
+"""
+
+_COLUMNS = "id, spin_number, winner, winners, timestamp, magic"
+_INSERT = (
+    "INSERT INTO spins (history, spin_number, winner, winners, timestamp, magic)"
+    " VALUES (?, ?, ?, ?, ?, ?)"
+)
+# Largest SQLite rowid, the cursor for the newest page
+_LAST_ID = 2 ** 63 - 1
+
+
+def _row(result):
+    """Ledger columns for one history entry"""
+    if not isinstance(result, dict):
+        result = {"winner": result}
+    winners = result.get("winners")
+    return (
+        result.get("spin_number"),
+        result.get("winner"),
+        json.dumps(winners) if winners is not None else None,
+        result.get("timestamp"),
+        int(bool(result.get("magic", False))),
+    )
+
+
+def _result(row):
+    """History entry for one ledger row, in the shape the app records"""
+    _, spin_number, winner, winners, timestamp, magic = row
+    result = {"winner": winner, "timestamp": timestamp, "magic": bool(magic), "spin_number": spin_number}
+    if winners is not None:
+        result["winners"] = json.loads(winners)
+    return result
+
+
+class Ledger:
+    """Append-only spin history in SQLite, shared by every session of the app"""
+
+    def __init__(self, path=LEDGER_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        self._pending = []
+        # Next spin ID per history, read from the table on first use
+        self._next_numbers = {}
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL makes NORMAL safe against corruption; at worst the last commit is lost
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def next_spin_number(self, history):
+        """ID the next spin appended to ``history`` will get"""
+        with self._lock:
+            if history not in self._next_numbers:
+                self.flush()
+                last = self._conn.execute(
+                    "SELECT MAX(spin_number) FROM spins WHERE history = ?", (history,)
+                ).fetchone()[0]
+                self._next_numbers[history] = (last or 0) + 1
+            return self._next_numbers[history]
+
+    def append(self, history, results):
+        """Queue spins for ``history``; they are written in batches
+
+        Results without a ``spin_number`` are given the next ID in place.
+        The lock is held for one batch at a time, so other sessions can read
+        and spin while a large run of results is written.
+        """
+        results = iter(results)
+        while True:
+            chunk = list(islice(results, FLUSH_ROWS))
+            if not chunk:
+                return
+            with self._lock:
+                number = self.next_spin_number(history)
+                for result in chunk:
+                    if result.get("spin_number") is None:
+                        result["spin_number"] = number
+                    number = max(number, result["spin_number"] + 1)
+                    self._pending.append((history,) + _row(result))
+                self._next_numbers[history] = number
+                if len(self._pending) >= FLUSH_ROWS:
+                    self.flush()
+            if len(chunk) < FLUSH_ROWS:
+                return
+            # Let a session waiting on the lock take it before the next batch
+            time.sleep(0)
+
+    def flush(self):
+        """Write every queued spin in a single transaction"""
+        with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            with self._transaction():
+                self._conn.executemany(_INSERT, pending)
+
+    def replace(self, history, results):
+        """Atomically swap the whole of ``history`` for ``results``"""
+        with self._lock:
+            self.flush()
+            with self._transaction():
+                self._conn.execute("DELETE FROM spins WHERE history = ?", (history,))
+                self._conn.executemany(_INSERT, ((history,) + _row(result) for result in results))
+            self._next_numbers.pop(history, None)
+
+    def adopt(self, staging, history):
+        """Atomically make the spins staged under ``staging`` the whole of ``history``"""
+        with self._lock:
+            self.flush()
+            with self._transaction():
+                self._conn.execute("DELETE FROM spins WHERE history = ?", (history,))
+                self._conn.execute("UPDATE spins SET history = ? WHERE history = ?", (history, staging))
+            self._next_numbers.pop(history, None)
+            self._next_numbers.pop(staging, None)
+
+    def discard(self, history):
+        """Drop every spin of ``history``, including any still buffered"""
+        with self._lock:
+            self._pending = [row for row in self._pending if row[0] != history]
+            with self._transaction():
+                self._conn.execute("DELETE FROM spins WHERE history = ?", (history,))
+            self._next_numbers.pop(history, None)
+
+    def tallies(self, history):
+        """Win counts for ``history`` as ``ResultsAggregator.from_counts`` takes them
+
+        Counted by SQLite with GROUP BY rather than by reading every entry;
+        only multi-winner draws, whose names are stored as JSON, are read.
+        """
+        with self._lock:
+            self.flush()
+            total, magic_total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(magic), 0) FROM spins WHERE history = ?", (history,)
+            ).fetchone()
+            single = self._conn.execute(
+                "SELECT winner, COUNT(*), MIN(id) FROM spins WHERE history = ? AND winners IS NULL GROUP BY winner",
+                (history,)
+            ).fetchall()
+            magic = self._conn.execute(
+                "SELECT winner, COUNT(*) FROM spins WHERE history = ? AND magic GROUP BY winner", (history,)
+            ).fetchall()
+            draws = self._conn.execute(
+                "SELECT id, winners FROM spins WHERE history = ? AND winners IS NOT NULL ORDER BY id", (history,)
+            ).fetchall()
+
+        # Names keep the order of their first win, as if the history had been
+        # replayed: by entry id, then by place within a multi-winner draw
+        first = {winner: ((row_id, 0), count) for winner, count, row_id in single}
+        for row_id, winners in draws:
+            for place, winner in enumerate(json.loads(winners)):
+                first_win, count = first.get(winner, ((row_id, place), 0))
+                first[winner] = (min(first_win, (row_id, place)), count + 1)
+        wins = [(winner, count) for winner, (_, count) in sorted(first.items(), key=lambda item: item[1][0])]
+        return {"total": total, "magic_total": magic_total, "wins": wins, "magic_wins": dict(magic)}
+
+    def page(self, history, before=None, limit=8):
+        """Up to ``limit`` entries older than id ``before``, newest first
+
+        Returns ``(rows, cursor)`` where each row is ``(id, result)`` and
+        ``cursor`` is the ``before`` value for the next (older) page, or
+        ``None`` when this was the last one.
+        """
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM spins WHERE history = ? AND id < ? ORDER BY id DESC LIMIT ?",
+                (history, _LAST_ID if before is None else before, limit + 1)
+            ).fetchall()
+        cursor = rows[limit - 1][0] if len(rows) > limit else None
+        return [(row[0], _result(row)) for row in rows[:limit]], cursor
+
+    def spin(self, history, spin_number):
+        """The entry of ``history`` with ID ``spin_number``, or ``None``"""
+        with self._lock:
+            self.flush()
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM spins WHERE history = ? AND spin_number = ? ORDER BY id LIMIT 1",
+                (history, spin_number)
+            ).fetchone()
+        return _result(row) if row else None
+
+    def results(self, history, since=None, before=None, winner=None, chunk_size=FLUSH_ROWS):
+        """Every entry of ``history`` oldest first, read in chunks
+
+        ``since`` / ``before`` bound the ISO timestamps (inclusive / exclusive)
+        and ``winner`` keeps spins that name that participant, including as
+        one of the winners of a multi-winner draw.
+        """
+        where = ["history = ?", "id > ?"]
+        params = [history]
+        if since is not None:
+            where.append("timestamp >= ?")
+            params.append(since)
+        if before is not None:
+            where.append("timestamp < ?")
+            params.append(before)
+        if winner is not None:
+            where.append("(winner = ? OR instr(winners, ?) > 0)")
+            params.extend([winner, json.dumps(winner)])
+        query = f"SELECT {_COLUMNS} FROM spins WHERE {' AND '.join(where)} ORDER BY id LIMIT ?"
+
+        last_id = 0
+        while True:
+            with self._lock:
+                self.flush()
+                rows = self._conn.execute(query, (params[0], last_id, *params[1:], chunk_size)).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield _result(row)
+            last_id = rows[-1][0]
+
+    @contextmanager
+    def _transaction(self):
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+
+@st.cache_resource(show_spinner=False)
+def open_ledger():
+    """The app-wide ledger, or an in-memory one when the disk is not writable"""
+    try:
+        return Ledger()
+    except sqlite3.Error:
+        # Read-only deployments keep the history for the life of the process only
+        return Ledger(":memory:")
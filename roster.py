@@ -0,0 +1,293 @@
+import bisect
+import math
+import random
+from collections import deque
+from itertools import count, repeat
+
+from spin_engine import FenwickSampler
+
+# Process-wide so a version number never repeats, even across rosters
+_versions = count(1)
+
+
+class Roster:
+    """Insertion-ordered participant list with a hash index from name to positions
+
+    Membership tests, counts and removals go through the index instead of
+    scanning the list, so they stay O(1) for raffles with hundreds of
+    thousands of entries. Duplicate names are kept as separate entries; the
+    index holds a name's slot directly and only switches to a queue of slots
+    once the name repeats, which keeps big rosters of unique names compact.
+    Removed entries leave a hole in their slot rather than shifting the ones
+    after them.
+    Every entry carries a weight (1 unless given) that scales its share of
+    the wheel and its chance of being drawn, and optionally a group label
+    (team, department...) used to colour the wheel. The roster doubles as a spin
+    sampler: Fenwick trees over the slot weights and over the live slots are
+    built on the first draw and then kept in step with every append and
+    removal in O(log n).
+    """
+
+    def __init__(self, names=(), weights=None, groups=None):
+        self._slots = []
+        self._weights = []
+        self._groups = []
+        self._positions = {}
+        self._removed = 0
+        # Entries whose weight is not 1, and entries with a group
+        self._weighted = 0
+        self._grouped = 0
+        # Fenwick trees over slot weights and live slots, built on first use
+        self._weight_tree = None
+        self._live_tree = None
+        # Changes on every edit so callers can cache work derived from the roster
+        self.version = next(_versions)
+        self.extend(names, weights, groups)
+
+    def __len__(self):
+        return len(self._slots) - self._removed
+
+    def __iter__(self):
+        return (name for name in self._slots if name is not None)
+
+    def __contains__(self, name):
+        return name in self._positions
+
+    def count(self, name):
+        """Number of entries for ``name``"""
+        held = self._positions.get(name)
+        if held is None:
+            return 0
+        return 1 if isinstance(held, int) else len(held)
+
+    def distinct_count(self):
+        """Number of distinct names"""
+        return len(self._positions)
+
+    def group_codes(self):
+        """One small integer per entry, shared by entries with the same name"""
+        codes = {}
+        return [codes.setdefault(name, len(codes)) for name in self]
+
+    def _link(self, name, slot):
+        """Add ``slot`` to the index for ``name``, keeping its slots in order"""
+        held = self._positions.get(name)
+        if held is None:
+            self._positions[name] = slot
+        elif isinstance(held, int):
+            self._positions[name] = deque(sorted((held, slot)))
+        elif slot > held[-1]:
+            held.append(slot)
+        else:
+            bisect.insort(held, slot)
+
+    def _unlink(self, name, slot):
+        held = self._positions[name]
+        if isinstance(held, int):
+            del self._positions[name]
+        else:
+            held.remove(slot)
+            if len(held) == 1:
+                self._positions[name] = held[0]
+
+    def _count_defaults(self, slot, sign):
+        """Track entries with a non-default weight or a group"""
+        if self._weights[slot] != 1:
+            self._weighted += sign
+        if self._groups[slot] is not None:
+            self._grouped += sign
+
+    def append(self, name, weight=1, group=None):
+        """Add an entry at the end of the roster"""
+        if not weight > 0:
+            raise ValueError(f"weight for {name!r} must be positive, got {weight!r}")
+        slot = len(self._slots)
+        self._link(name, slot)
+        self._slots.append(name)
+        self._weights.append(weight)
+        self._groups.append(group)
+        self._count_defaults(slot, 1)
+        if self._weight_tree is not None:
+            self._weight_tree.append(weight)
+            self._live_tree.append(1)
+        self.version = next(_versions)
+
+    def extend(self, names, weights=None, groups=None):
+        """Add several entries at the end of the roster"""
+        weights = repeat(1) if weights is None else weights
+        groups = repeat(None) if groups is None else groups
+        for name, weight, group in zip(names, weights, groups):
+            self.append(name, weight, group)
+
+    def set_entry(self, position, name, weight=1, group=None):
+        """Overwrite the entry at ``position`` in place"""
+        if not weight > 0:
+            raise ValueError(f"weight for {name!r} must be positive, got {weight!r}")
+        slot = self._slot(position)
+        if name != self._slots[slot]:
+            self._unlink(self._slots[slot], slot)
+            self._link(name, slot)
+        self._count_defaults(slot, -1)
+        self._slots[slot] = name
+        self._weights[slot] = weight
+        self._groups[slot] = group
+        self._count_defaults(slot, 1)
+        if self._weight_tree is not None:
+            self._weight_tree.update(slot, weight)
+        self.version = next(_versions)
+
+    def remove(self, name):
+        """Remove the first entry for ``name``, like ``list.remove``"""
+        held = self._positions.get(name)
+        if held is None:
+            raise ValueError(f"{name!r} is not in the roster")
+        self._clear(held if isinstance(held, int) else held[0])
+
+    def pop(self, position):
+        """Remove and return the name at ``position``, like ``list.pop``"""
+        slot = self._slot(position)
+        name = self._slots[slot]
+        self._clear(slot)
+        return name
+
+    def _clear(self, slot):
+        """Leave a hole in ``slot``"""
+        self._unlink(self._slots[slot], slot)
+        self._count_defaults(slot, -1)
+        self._slots[slot] = None
+        self._weights[slot] = None
+        self._groups[slot] = None
+        if self._weight_tree is not None:
+            self._weight_tree.remove(slot)
+            self._live_tree.remove(slot)
+        self._removed += 1
+        self.version = next(_versions)
+
+    def index(self, name):
+        """Position of the first entry for ``name``, like ``list.index``"""
+        held = self._positions.get(name)
+        if held is None:
+            raise ValueError(f"{name!r} is not in the roster")
+        return self._position(held if isinstance(held, int) else held[0])
+
+    def _position(self, slot):
+        """Position of an occupied slot among the remaining entries"""
+        if not self._removed:
+            return slot
+        self._build_trees()
+        return self._live_tree.prefix_sum(slot)
+
+    def _slot(self, position):
+        """Slot holding the entry at ``position``"""
+        if not 0 <= position < len(self):
+            raise IndexError("roster index out of range")
+        if not self._removed:
+            return position
+        self._build_trees()
+        # The live tree holds 1 per occupied slot, so the cumulative count finds it
+        return self._live_tree.find(position)
+
+    def rows(self, start=0):
+        """``(position, name, weight, group)`` for each entry from ``start`` on"""
+        if start >= len(self):
+            return
+        position = start
+        for slot in range(self._slot(start), len(self._slots)):
+            name = self._slots[slot]
+            if name is not None:
+                yield position, name, self._weights[slot], self._groups[slot]
+                position += 1
+
+    def _build_trees(self):
+        if self._weight_tree is None:
+            self._weight_tree = FenwickSampler(weight or 0 for weight in self._weights)
+            self._live_tree = FenwickSampler(int(name is not None) for name in self._slots)
+
+    def sample(self, rng=random):
+        """Draw a position with probability proportional to its weight"""
+        self._build_trees()
+        return self._position(self._weight_tree.sample(rng))
+
+    def entries(self):
+        """(name, weight) pairs in roster order"""
+        return [(name, weight) for name, weight in zip(self._slots, self._weights) if name is not None]
+
+    def weights(self):
+        """Entry weights in roster order"""
+        return [weight for weight in self._weights if weight is not None]
+
+    def is_weighted(self):
+        """Whether any entry has a weight other than 1"""
+        return self._weighted > 0
+
+    def groups(self):
+        """Entry groups in roster order (``None`` for ungrouped entries)"""
+        return [group for name, group in zip(self._slots, self._groups) if name is not None]
+
+    def is_grouped(self):
+        """Whether any entry has a group"""
+        return self._grouped > 0
+
+    def to_list(self):
+        """Entries in roster order"""
+        return list(self)
+
+    def to_export(self):
+        """Serialisable form: a plain list, or a compact mapping
+
+        The mapping is used when names repeat, weights differ or entries are
+        grouped. Each distinct name is stored once in ``names``; with
+        duplicates, ``entries`` lists the roster order as indexes into it.
+        ``weights`` holds one weight per entry when any of them is not 1, and
+        ``groups`` one group (or null) per entry when any entry has one.
+        """
+        duplicates = len(self._positions) != len(self)
+        weighted = self.is_weighted()
+        if not duplicates and not weighted and not self.is_grouped():
+            return self.to_list()
+
+        names = list(self._positions) if duplicates else self.to_list()
+        data = {"names": names}
+        if duplicates:
+            lookup = {name: i for i, name in enumerate(names)}
+            data["entries"] = [lookup[name] for name in self]
+        if weighted:
+            data["weights"] = self.weights()
+        if self.is_grouped():
+            data["groups"] = self.groups()
+        return data
+
+    @classmethod
+    def from_export(cls, data):
+        """Rebuild a roster from ``to_export`` output or a plain list of names"""
+        if isinstance(data, dict):
+            names = data["names"]
+            if "entries" in data:
+                names = [names[i] for i in data["entries"]]
+            return cls(names, data.get("weights"), data.get("groups"))
+        return cls(data)
+
+
+def _parse_weight(text):
+    try:
+        value = float(text)
+    except ValueError:
+        return None
+    return value if value > 0 and math.isfinite(value) else None
+
+
+def parse_entry(line):
+    """Split a pasted line of the form ``name``, ``name | weight`` or
+    ``name | weight | group`` into ``(name, weight, group)``"""
+    parts = line.rsplit("|", 2)
+    if len(parts) == 3:
+        weight = _parse_weight(parts[1])
+        if weight is not None:
+            return parts[0].strip(), weight, parts[2].strip() or None
+    if len(parts) >= 2:
+        name, _, weight = line.rpartition("|")
+        weight = _parse_weight(weight)
+        if weight is not None:
+            return name.strip(), weight, None
+    return line.strip(), 1, None
+
@@ -0,0 +1,181 @@
+import csv
+import io
+import math
+import os
+
+from config_import import MAX_NAME_LENGTH, MAX_PARTICIPANTS
+from roster import Roster
+
+# Spreadsheet roster import. Rows are streamed straight from the upload into
+# a Roster: CSV/TSV through csv.reader over a text wrapper, XLSX through
+# openpyxl's read-only mode, which parses the sheet XML as it goes. Nothing
+# holds the whole file, and duplicates are caught by the roster's name index
+# as each row lands, so million-row sheets load in one pass.
+#
+# Columns are mapped to the fields below; only ``name`` is required. Rows
+# whose ``active`` cell is falsy ("no", "0", "false"...) are skipped.
+EXTENSIONS = ["csv", "tsv", "txt", "xlsx"]
+FIELDS = ("name", "weight", "group", "active")
+
+# Header spellings recognised when guessing the column mapping
+_ALIASES = {
+    "name": ("name", "participant", "full name", "entrant", "entry", "email"),
+    "weight": ("weight", "tickets", "chances", "entries", "odds"),
+    "group": ("group", "team", "department", "category"),
+    "active": ("active", "enabled", "include", "eligible"),
+}
+_INACTIVE = {"0", "false", "no", "n", "off", "inactive", "disabled"}
+
+SNIFF_BYTES = 64 * 1024
+PROGRESS_EVERY = 5000
+
+
+class RosterImportError(ValueError):
+    """The upload cannot be read as a participant sheet"""
+
+
+def _csv_rows(file, extension):
+    sample = file.read(SNIFF_BYTES)
+    file.seek(0)
+    if extension == "tsv":
+        dialect = csv.excel_tab
+    else:
+        try:
+            dialect = csv.Sniffer().sniff(sample.decode("utf-8", "ignore"), delimiters=",;\t|")
+        except csv.Error:
+            dialect = csv.excel
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.reader(text, dialect)
+    except UnicodeDecodeError:
+        raise RosterImportError("the file is not valid UTF-8 text") from None
+    except csv.Error as e:
+        # A field over csv's size limit, usually a stray unclosed quote
+        raise RosterImportError(f"not a readable CSV file ({e})") from None
+    finally:
+        # Hand the upload back unclosed so it can be read again on the next run
+        text.detach()
+
+
+def _xlsx_rows(file):
+    try:
+        import openpyxl
+    except ImportError:
+        raise RosterImportError("reading .xlsx files needs the openpyxl package; save the sheet as CSV instead") from None
+    try:
+        book = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    except Exception as e:
+        raise RosterImportError(f"not a readable .xlsx workbook ({e})") from None
+    try:
+        yield from book.active.iter_rows(values_only=True)
+    except Exception as e:
+        raise RosterImportError(f"not a readable .xlsx workbook ({e})") from None
+    finally:
+        book.close()
+
+
+def open_rows(file, filename):
+    """Iterator over the rows of an uploaded sheet, header row included"""
+    extension = os.path.splitext(filename)[1].lower().lstrip(".")
+    if extension not in EXTENSIONS:
+        raise RosterImportError(f"unsupported file type .{extension}")
+    file.seek(0)
+    if extension == "xlsx":
+        return _xlsx_rows(file)
+    return _csv_rows(file, extension)
+
+
+def read_header(file, filename):
+    """Column titles from the first row of the sheet"""
+    rows = open_rows(file, filename)
+    try:
+        header = next(rows, None)
+    finally:
+        rows.close()
+    if not header:
+        raise RosterImportError("the sheet is empty")
+    return [_text(title) or f"Column {i + 1}" for i, title in enumerate(header)]
+
+
+def guess_mapping(header):
+    """Field -> column index for the columns whose titles look familiar"""
+    titles = [title.strip().lower() for title in header]
+    mapping = {}
+    for field in FIELDS:
+        for alias in _ALIASES[field]:
+            if alias in titles and titles.index(alias) not in mapping.values():
+                mapping[field] = titles.index(alias)
+                break
+    if "name" not in mapping and header:
+        # No recognised title: the first unmapped column holds the names. When
+        # every column went to another field (a lone "Entries" column, say),
+        # the names win the first column from whichever field claimed it.
+        free = [i for i in range(len(header)) if i not in mapping.values()]
+        column = free[0] if free else 0
+        mapping = {field: i for field, i in mapping.items() if i != column}
+        mapping["name"] = column
+    return mapping
+
+
+def _text(value):
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _cell(row, column):
+    return row[column] if column is not None and column < len(row) else None
+
+
+def _weight(value):
+    if value is None or value == "":
+        return 1
+    try:
+        weight = float(value)
+    except (TypeError, ValueError):
+        return None
+    # "inf" parses too, and would make every slice size NaN
+    return weight if weight > 0 and math.isfinite(weight) else None
+
+
+def load_roster(rows, mapping, roster=None, allow_duplicates=False, on_progress=None):
+    """Append the data rows of a sheet to ``roster`` (a new one by default)
+
+    ``rows`` must already be past the header. ``mapping`` gives the column
+    index for each field in ``FIELDS``; ``name`` is required. Unless
+    ``allow_duplicates``, a name already on the roster is skipped.
+    ``on_progress(rows_read)`` is called every ``PROGRESS_EVERY`` rows.
+    Returns the roster and counts of ``added``, ``duplicates``, ``inactive``
+    and ``invalid`` rows.
+    """
+    roster = Roster() if roster is None else roster
+    name_column = mapping["name"]
+    weight_column = mapping.get("weight")
+    group_column = mapping.get("group")
+    active_column = mapping.get("active")
+    counts = {"added": 0, "duplicates": 0, "inactive": 0, "invalid": 0}
+
+    for read, row in enumerate(rows, 1):
+        if on_progress and read % PROGRESS_EVERY == 0:
+            on_progress(read)
+        name = _text(_cell(row, name_column))
+        if not name and not any(_text(cell) for cell in row):
+            # Blank lines are common at the end of exported sheets
+            continue
+        if active_column is not None and _text(_cell(row, active_column)).lower() in _INACTIVE:
+            counts["inactive"] += 1
+            continue
+        weight = _weight(_cell(row, weight_column))
+        if not name or len(name) > MAX_NAME_LENGTH or weight is None:
+            counts["invalid"] += 1
+            continue
+        if not allow_duplicates and name in roster:
+            counts["duplicates"] += 1
+            continue
+        if len(roster) >= MAX_PARTICIPANTS:
+            raise RosterImportError(f"at most {MAX_PARTICIPANTS:,} participants can be imported")
+        roster.append(name, weight, _text(_cell(row, group_column)) or None)
+        counts["added"] += 1
+    return roster, counts
@@ -0,0 +1,22 @@
+import streamlit as st
+from starlette.middleware import Middleware
+
+from assets import ImmutableStaticMiddleware, check_vendor_assets
+from history_export import export_route
+
+# Production entry point: `streamlit run server.py` (or `uvicorn server:app`)
+# runs Wheel.py with hashed static assets served immutable and precompressed,
+# plus /export/history for streaming large history exports straight from the
+# ledger. `streamlit run Wheel.py` still works, with Streamlit's default
+# caching and in-app (buffered) history downloads only.
+#
+# The wheel's scripts and fonts must have been bundled with vendor_assets.py
+# (or WHEEL_ALLOW_CDN=1 set), so a kiosk never starts with a wheel that can
+# only render online.
+check_vendor_assets()
+
+app = st.App(
+    "Wheel.py",
+    routes=[export_route()],
+    middleware=[Middleware(ImmutableStaticMiddleware)],
+)
@@ -0,0 +1,354 @@
+import heapq
+import random
+from collections import Counter
+
+# Server-side spin engine. Python decides every outcome up front and the wheel
+# only animates to the angle computed here, so the browser never rolls its own
+# dice and the recorded winner always matches the segment under the pointer.
+
+# Fraction of a segment's width the stop angle may wander from its centre.
+# Keeps landings looking natural while staying clear of the segment borders.
+STOP_JITTER = 0.6
+
+
+def segment_bounds(segments, index):
+    """Start and end angle (degrees, clockwise from the pointer) of a segment"""
+    sizes = [segment.get("size") for segment in segments]
+    if not any(sizes):
+        width = 360 / len(segments)
+        return index * width, (index + 1) * width
+
+    start = sum(sizes[:index])
+    return start, start + sizes[index]
+
+
+def stop_angle_for(segments, index, rng=random):
+    """Pick an angle inside the given segment for the wheel to stop on"""
+    start, end = segment_bounds(segments, index)
+    width = end - start
+    offset = (rng.random() - 0.5) * width * STOP_JITTER
+    return start + width / 2 + offset
+
+
+class AliasTable:
+    """Vose alias table for drawing an index with probability proportional to its weight
+
+    Building the table is O(n); every draw afterwards is O(1), one uniform
+    column pick plus one biased coin flip.
+    """
+
+    def __init__(self, weights):
+        n = len(weights)
+        total = sum(weights)
+        scaled = [weight * n / total for weight in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+
+        small = [i for i, p in enumerate(scaled) if p < 1]
+        large = [i for i, p in enumerate(scaled) if p >= 1]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1 - scaled[less]
+            (small if scaled[more] < 1 else large).append(more)
+        # Whatever is left is 1 up to rounding error and keeps prob 1.0
+
+    def __len__(self):
+        return len(self.prob)
+
+    def sample(self, rng=random):
+        """Draw one index"""
+        column = rng.randrange(len(self.prob))
+        return column if rng.random() < self.prob[column] else self.alias[column]
+
+
+class FenwickSampler:
+    """Weighted index sampler over a Fenwick (binary indexed) tree
+
+    Unlike the alias table it stays valid under edits: draws, weight updates,
+    removals (an update to weight 0) and appends are all O(log n), so a raffle
+    that drops every winner never rebuilds its tables between spins.
+    """
+
+    def __init__(self, weights=()):
+        self._weights = list(weights)
+        self._tree = [0] + self._weights
+        n = len(self._weights)
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                self._tree[parent] += self._tree[i]
+
+    def __len__(self):
+        return len(self._weights)
+
+    def weight(self, index):
+        return self._weights[index]
+
+    def total(self):
+        return self.prefix_sum(len(self._weights))
+
+    def prefix_sum(self, count):
+        """Sum of the first ``count`` weights"""
+        total = 0
+        while count > 0:
+            total += self._tree[count]
+            count -= count & -count
+        return total
+
+    def update(self, index, weight):
+        """Set the weight at ``index``"""
+        delta = weight - self._weights[index]
+        self._weights[index] = weight
+        i = index + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def remove(self, index):
+        """Take ``index`` out of the draw; its slot stays with weight 0"""
+        self.update(index, 0)
+
+    def append(self, weight):
+        """Add a weight at the end"""
+        self._weights.append(weight)
+        i = len(self._weights)
+        # Node i covers the weights in (i - lowbit(i), i]
+        self._tree.append(weight + self.prefix_sum(i - 1) - self.prefix_sum(i - (i & -i)))
+
+    def find(self, target):
+        """Index whose cumulative weight range contains ``target``"""
+        position = 0
+        step = 1 << (len(self._weights).bit_length() - 1) if self._weights else 0
+        while step:
+            nxt = position + step
+            if nxt < len(self._tree) and self._tree[nxt] <= target:
+                position = nxt
+                target -= self._tree[nxt]
+            step >>= 1
+        return position
+
+    def sample(self, rng=random):
+        """Draw one index"""
+        total = self.total()
+        while True:
+            index = self.find(rng.random() * total)
+            # Rounding can land past the end or on a zero weight; just redraw
+            if index < len(self._weights) and self._weights[index] > 0:
+                return index
+
+
+class ShuffleBag:
+    """Everyone-once-before-repeats selection over a roster
+
+    Holds the names not yet drawn this cycle in shuffled order. The next
+    winner is the end of the bag, so peeking and popping are O(1); an empty
+    bag refills with the whole roster and reshuffles. ``sync`` carries roster
+    edits into the running cycle instead of starting a new one: new entries
+    are shuffled into the bag, removed ones are taken out of it. Removing a
+    winner right after its spin goes through ``remove_entry`` instead, which
+    is O(1) and keeps the turns of the name's other entries. Weights are
+    ignored, everyone gets exactly one turn per cycle.
+    """
+
+    def __init__(self, rng=random):
+        self.rng = rng
+        self._bag = []
+        self._members = Counter()
+        self._roster = None
+
+    def __len__(self):
+        """Names left before the bag refills"""
+        return len(self._bag)
+
+    def sync(self, roster):
+        """Follow the roster's entries, keeping the current cycle"""
+        members = Counter(roster)
+        for name, missing in (self._members - members).items():
+            self._discard(name, missing)
+        for name, extra in (members - self._members).items():
+            for _ in range(extra):
+                # Append then swap into a uniform slot: still a fair shuffle
+                self._bag.append(name)
+                slot = self.rng.randrange(len(self._bag))
+                self._bag[slot], self._bag[-1] = self._bag[-1], self._bag[slot]
+        self._members = members
+        self._roster = roster
+
+    def remove_entry(self, name, drawn=False):
+        """Follow the removal of one roster entry for ``name`` without a full sync
+
+        ``drawn`` means the entry's turn was already taken this cycle, as for
+        a winner removed after ``take``; the bag is then left alone.
+        """
+        self._members[name] -= 1
+        if self._members[name] <= 0:
+            del self._members[name]
+        if not drawn:
+            self._discard(name, 1)
+
+    def _discard(self, name, count):
+        kept = []
+        for member in reversed(self._bag):
+            if member == name and count:
+                count -= 1
+            else:
+                kept.append(member)
+        kept.reverse()
+        self._bag = kept
+
+    def peek(self):
+        """Next name out of the bag"""
+        if not self._bag:
+            self._bag = list(self._members.elements())
+            self.rng.shuffle(self._bag)
+        return self._bag[-1]
+
+    def take(self, name):
+        """Mark ``name`` as drawn; O(1) unless it was not the next name"""
+        if self._bag and self._bag[-1] == name:
+            self._bag.pop()
+        else:
+            self._discard(name, 1)
+
+    def sample(self, rng=None):
+        """Roster position of the next name, without drawing it yet"""
+        return self._roster.index(self.peek())
+
+
+def weighted_sizes(weights):
+    """Segment sizes in degrees proportional to the weights"""
+    total = sum(weights)
+    return [360 * weight / total for weight in weights]
+
+
+def draw_spin(segments, forced_index=None, sampler=None, rng=random):
+    """Decide the outcome of the next spin before the wheel moves
+
+    ``forced_index`` is the segment of the magic-mode target for this spin,
+    or ``None`` (target absent or no magic) for a fair draw. A fair draw uses
+    ``sampler`` (e.g. an ``AliasTable`` over the entry weights) when given,
+    otherwise every segment is equally likely.
+    """
+    magic = forced_index is not None
+    if magic:
+        index = forced_index
+    elif sampler is not None:
+        index = sampler.sample(rng)
+    else:
+        index = rng.randrange(len(segments))
+
+    return {
+        "index": index,
+        "stopAngle": stop_angle_for(segments, index, rng),
+        "winner": segments[index]["text"],
+        "magic": magic
+    }
+
+
+def draw_distinct(k, n, weights=None, groups=None, rng=random):
+    """Pick up to ``k`` distinct entries out of ``n``, in draw order
+
+    Uniform rosters use a partial Fisher-Yates shuffle over a sparse swap
+    map, O(k) regardless of ``n``. Weighted rosters, or rosters where
+    ``groups`` ties entries together (at most one winner per group), use
+    Efraimidis-Spirakis keys: the ``k`` smallest Exp(1) / weight keys are
+    exactly what drawing one at a time without replacement would give,
+    found in O(n log k).
+    """
+    if weights is None and groups is None:
+        swapped = {}
+        picks = []
+        for i in range(min(k, n)):
+            j = rng.randrange(i, n)
+            picks.append(swapped.get(j, j))
+            swapped[j] = swapped.get(i, i)
+        return picks
+
+    best = {}
+    for i in range(n):
+        key = rng.expovariate(weights[i] if weights is not None else 1)
+        group = groups[i] if groups is not None else i
+        # A group draws as soon as its first entry does
+        if group not in best or key < best[group][0]:
+            best[group] = (key, i)
+    return [i for _, i in heapq.nsmallest(k, best.values())]
+
+
+def draw_winners(segments, k, weights=None, groups=None, forced_index=None, rng=random):
+    """Decide a ``k``-winner draw up front; the wheel lands on the first pick
+
+    Returns a ``draw_spin``-style outcome with the ranked ``winners`` added.
+    A magic-mode target takes first place and its group sits out the rest.
+    """
+    picks = draw_distinct(k, len(segments), weights, groups, rng)
+    magic = forced_index is not None
+    if magic:
+        group_of = groups if groups is not None else range(len(segments))
+        forced_group = group_of[forced_index]
+        picks = [forced_index] + [i for i in picks if group_of[i] != forced_group][:k - 1]
+
+    index = picks[0]
+    return {
+        "index": index,
+        "stopAngle": stop_angle_for(segments, index, rng),
+        "winner": segments[index]["text"],
+        "winners": [segments[i]["text"] for i in picks],
+        "magic": magic
+    }
+
+
+def draw_batch(count, n, weights=None, replace=True, groups=None, forced=None, seed=None):
+    """Draw ``count`` spins over ``n`` entries at once and return the winning positions
+
+    ``weights`` holds one weight per entry (``None`` for a uniform wheel). With
+    ``replace`` every spin sees the full roster, as when winners stay on the
+    wheel; without it each winning entry leaves the draw, and when ``groups``
+    gives each entry a group code (e.g. one per distinct name) the rest of its
+    group leaves with it. Sequential weighted draws without replacement are
+    equivalent to sorting Efraimidis-Spirakis keys, so both modes are a single
+    vectorized NumPy call. ``forced`` maps a spin offset to the position that
+    magic mode sends it to. Fewer than ``count`` positions come back once the
+    roster runs out.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    forced = forced or {}
+    p = None
+    if weights is not None:
+        p = np.asarray(weights, dtype=float)
+        p /= p.sum()
+
+    if replace:
+        picks = rng.choice(n, size=count, p=p)
+        for offset, position in forced.items():
+            picks[offset] = position
+        return picks
+
+    # Smallest Exp(1) / weight first == drawing one at a time without replacement
+    keys = rng.exponential(size=n)
+    if p is not None:
+        keys /= p
+    order = np.argsort(keys, kind="stable")
+    group_of = np.arange(n) if groups is None else np.asarray(groups)
+    if groups is not None:
+        # A group's first entry in key order is its draw; the rest go with it
+        _, first = np.unique(group_of[order], return_index=True)
+        order = order[np.sort(first)]
+    order = order[:count]
+
+    for offset, position in sorted(forced.items()):
+        if offset >= len(order):
+            continue
+        target = group_of[position]
+        drawn = group_of[order]
+        if np.any(drawn[:offset] == target):
+            # Already won earlier in the batch, so this spin stays fair
+            continue
+        later = np.flatnonzero(drawn == target)
+        if later.size:
+            order[later[0]] = order[offset]
+        order[offset] = position
+    return order
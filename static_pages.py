@@ -0,0 +1,239 @@
+import html
+import os
+import re
+
+import streamlit as st
+
+from assets import load_stylesheet, static_page_href, stylesheet_url, vendor_urls, write_static_page
+
+# Static sections. The header, the global stats, the knowledge base and the
+# footer never depend on the session, so instead of being re-sent as
+# markdown on every run they are built once per process into content-hashed
+# pages under static/pages (served immutable by server.py) and embedded by
+# iframe; a rerun then only carries the iframe's URL. Without static serving
+# they are rendered inline from the same cached strings.
+#
+# Markdown payload per full run, before -> after:
+#   header                            894 B  ->  one iframe element
+#   stats, knowledge base and footer  9,435 B  ->  one iframe element
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+CONTENT_DIR = os.path.join(_APP_DIR, "content")
+
+HEADER_HTML = """
+<div class="premium-header">
+    <h1 class="brand-title">WheelMaster Pro™</h1>
+    <p class="brand-subtitle">The World's Most Trusted Decision Wheel Since 2019</p>
+    <div class="trust-indicators">
+        <div class="trust-badge">
+            <span class="icon">🏆</span>
+            <span>6+ Years Trusted</span>
+        </div>
+        <div class="trust-badge">
+            <span class="icon">🌍</span>
+            <span>2.1M+ Global Users</span>
+        </div>
+        <div class="trust-badge">
+            <span class="icon">🔒</span>
+            <span>Enterprise Security</span>
+        </div>
+        <div class="trust-badge">
+            <span class="icon">⚡</span>
+            <span>99.9% Uptime</span>
+        </div>
+        <div class="trust-badge">
+            <span class="icon">🎯</span>
+            <span>1.8B+ Decisions Made</span>
+        </div>
+    </div>
+</div>
+"""
+
+GLOBAL_STATS = [
+    ("1.8B+", "Decisions Made", "🎯"),
+    ("2.1M+", "Active Users", "👥"),
+    ("180+", "Countries", "🌍"),
+    ("99.97%", "Uptime SLA", "⚡")
+]
+
+# No blank lines: the inline fallback goes through Markdown, where they end the HTML block
+GLOBAL_STATS_HTML = """
+<div class="global-stats">
+    <h2 class="global-stats-title">🌍 WheelMaster Pro™ Global Impact</h2>
+    <p style="color: var(--text-secondary); font-size: 1.1rem; margin-bottom: 2rem;">
+        Trusted worldwide since 2019 • Powering decisions across 180+ countries
+    </p>
+</div>
+<div class="metric-grid">
+""" + "\n".join(f"""    <div class="premium-metric">
+        <div style="font-size: 2rem; margin-bottom: 0.5rem;">{icon}</div>
+        <div class="metric-value">{value}</div>
+        <div class="metric-label">{label}</div>
+    </div>""" for value, label, icon in GLOBAL_STATS) + """
+</div>
+"""
+
+KNOWLEDGE_BASE_HEADING = """
+<div class="kb-heading">
+    <h2>💡 Professional Knowledge Base</h2>
+    <p>Everything you need to know about professional decision-making</p>
+</div>
+"""
+
+# Tab title and the Markdown file under content/ it shows
+KNOWLEDGE_BASE_TABS = [
+    ("🚀 Getting Started", "getting_started.md"),
+    ("🎩 Magic Mode", "magic_mode.md"),
+    ("🔒 Enterprise Security", "security.md"),
+    ("🏆 About Us", "about.md"),
+]
+
+FOOTER_HTML = """
+<div class="thin-footer">
+    <div class="footer-content">
+        <div class="footer-links">
+            <a href="#home">Home</a>
+            <a href="#about">About</a>
+            <a href="#privacy">Privacy</a>
+            <a href="#terms">Terms</a>
+            <a href="#contact">Contact</a>
+        </div>
+        <div class="footer-copyright">
+            © 2025 DecisionFlow Inc. All rights reserved.
+        </div>
+    </div>
+</div>
+"""
+
+# Grows the iframe to the page's height, on load and whenever a tab changes
+_FIT_FRAME = """
+<script>
+const fit = () => {
+    if (window.frameElement) window.frameElement.style.height = document.documentElement.scrollHeight + "px";
+};
+addEventListener("load", fit);
+addEventListener("resize", fit);
+addEventListener("change", fit);
+</script>
+"""
+
+# Heights used until the page has fitted its frame
+HEADER_HEIGHT = 320
+SECTIONS_HEIGHT = 1400
+
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_LIST_ITEM = re.compile(r"(- |\d+\. )(.*)")
+_HEADING = re.compile(r"(#{1,6}) (.*)")
+
+
+@st.cache_resource(show_spinner=False)
+def _read_content(filename):
+    with open(os.path.join(CONTENT_DIR, filename), encoding="utf-8") as f:
+        return f.read()
+
+
+def markdown_html(text):
+    """HTML for the Markdown subset of content/: headings, paragraphs, **bold** and lists"""
+    out = []
+    list_tag = None
+    for line in text.splitlines():
+        line = line.strip()
+        item = _LIST_ITEM.match(line)
+        tag = None if not item else ("ul" if item.group(1) == "- " else "ol")
+        if list_tag and tag != list_tag:
+            out.append(f"</{list_tag}>")
+            list_tag = None
+        if not line:
+            continue
+        heading = _HEADING.match(line)
+        if item:
+            if not list_tag:
+                list_tag = tag
+                out.append(f"<{tag}>")
+            out.append(f"<li>{_inline(item.group(2))}</li>")
+        elif heading:
+            level = len(heading.group(1))
+            out.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+        else:
+            out.append(f"<p>{_inline(line)}</p>")
+    if list_tag:
+        out.append(f"</{list_tag}>")
+    return "\n".join(out)
+
+
+def _inline(text):
+    return _BOLD.sub(r"<strong>\1</strong>", html.escape(text, quote=False))
+
+
+def knowledge_base_html():
+    """The knowledge base as radio-button tabs that work without script"""
+    inputs, labels, panels, rules = [], [], [], []
+    for i, (title, filename) in enumerate(KNOWLEDGE_BASE_TABS):
+        inputs.append(f'<input type="radio" name="kb-tab" id="kb-tab-{i}"{" checked" if i == 0 else ""}>')
+        labels.append(f'<label for="kb-tab-{i}">{title}</label>')
+        panels.append(f'<section class="kb-panel kb-panel-{i}">{markdown_html(_read_content(filename))}</section>')
+        rules.append(
+            f"#kb-tab-{i}:checked ~ .kb-panel-{i} {{ display: block; }}\n"
+            f"#kb-tab-{i}:checked ~ .kb-tab-bar label[for=kb-tab-{i}] "
+            f"{{ color: var(--text-primary); border-bottom-color: var(--primary-solid); }}"
+        )
+    return (
+        f"<style>{''.join(rules)}</style>\n"
+        f'<div class="kb-tabs">{"".join(inputs)}<nav class="kb-tab-bar">{"".join(labels)}</nav>'
+        f'{"".join(panels)}</div>'
+    )
+
+
+def _document(body, stylesheets):
+    links = [vendor_urls()["fonts"]] + [stylesheet_url(name) for name in stylesheets]
+    head = "".join(f'<link rel="stylesheet" href="{static_page_href(url)}">' for url in links)
+    return (
+        f'<!DOCTYPE html>\n<html lang="en"><head><meta charset="utf-8">{head}</head>'
+        f'<body class="static-page">{body}{_FIT_FRAME}</body></html>'
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def static_page_src(name):
+    """Build the named static page once; its iframe src, or None to render inline"""
+    stylesheets = ["premium", "static_page"]
+    if name == "header":
+        body = HEADER_HTML
+    else:
+        body = GLOBAL_STATS_HTML + "<hr>" + KNOWLEDGE_BASE_HEADING + knowledge_base_html() + FOOTER_HTML
+        stylesheets.append("thin_footer")
+    # Links inside the page are relative, so every stylesheet has to be served too
+    if not all(stylesheet_url(sheet) for sheet in stylesheets):
+        return None
+    url = write_static_page(name, _document(body, stylesheets))
+    if url is None:
+        return None
+    base = st.get_option("server.baseUrlPath").strip("/")
+    return f"/{base}/{url}" if base else f"/{url}"
+
+
+def render_header():
+    """The premium header"""
+    src = static_page_src("header")
+    if src is None:
+        st.markdown(HEADER_HTML, unsafe_allow_html=True)
+    else:
+        st.iframe(src, height=HEADER_HEIGHT, alt="WheelMaster Pro header")
+
+
+def render_static_sections():
+    """Global stats, the knowledge base and the footer"""
+    src = static_page_src("sections")
+    if src is not None:
+        st.iframe(src, height=SECTIONS_HEIGHT, alt="Global stats and knowledge base")
+        return
+
+    st.markdown(GLOBAL_STATS_HTML, unsafe_allow_html=True)
+    st.markdown("---")
+    load_stylesheet("static_page")
+    st.markdown(KNOWLEDGE_BASE_HEADING, unsafe_allow_html=True)
+    tabs = st.tabs([title for title, _ in KNOWLEDGE_BASE_TABS])
+    for tab, (_, filename) in zip(tabs, KNOWLEDGE_BASE_TABS):
+        with tab:
+            st.markdown(_read_content(filename))
+    load_stylesheet("thin_footer")
+    st.markdown(FOOTER_HTML, unsafe_allow_html=True)
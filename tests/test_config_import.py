@@ -0,0 +1,124 @@
+import io
+import json
+
+import pytest
+
+from config_import import ConfigImportError, import_configuration, iter_config
+from ledger import Ledger
+from roster import Roster
+
+
+class Trickle(io.RawIOBase):
+    """Binary file that hands out at most ``step`` bytes per read"""
+
+    def __init__(self, data, step):
+        self._data = data
+        self._pos = 0
+        self._step = step
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        chunk = self._data[self._pos:self._pos + self._step]
+        self._pos += len(chunk)
+        return chunk
+
+
+def _items(data, step=None):
+    file = io.BytesIO(data) if step is None else Trickle(data, step)
+    return [(key, list(value) if key.startswith("names.") else value) for key, value in iter_config(file)]
+
+
+def _config(**fields):
+    return json.dumps(dict({"metadata": {"version": "3.0.0"}}, **fields)).encode("utf-8")
+
+
+CONFIG = json.dumps({
+    "metadata": {"version": "3.0.0", "note": "Zoë — ünïcödé"},
+    "names": ["Ann", "Béla", "Çem", "  spaced  "],
+    "settings": {"spin_count": 12, "render_mode": "canvas"},
+    "results": [{"winner": "Ann", "spin_number": 1}, "Béla", {"winner": "Çem", "magic": True}],
+    "numbers": [1, 22, 333, -4.5e3, 123456789],
+}, indent=2).encode("utf-8")
+
+
+@pytest.mark.parametrize("step", [1, 2, 3, 7, 64])
+def test_chunk_boundaries_do_not_change_the_result(step):
+    assert _items(CONFIG, step) == _items(CONFIG)
+
+
+def test_streamed_arrays_are_yielded_per_element():
+    items = _items(CONFIG)
+    assert [value for key, value in items if key == "names"] == ["Ann", "Béla", "Çem", "  spaced  "]
+    assert [value for key, value in items if key == "results"][1] == "Béla"
+    assert ("numbers", [1, 22, 333, -4.5e3, 123456789]) in items
+
+
+@pytest.mark.parametrize("step", [1, 5, None])
+def test_compact_form_arrays_are_streamed(step):
+    data = _config(names={"names": ["a", "b"], "entries": [0, 1, 0], "weights": [1, 2.5, 3],
+                          "groups": ["x", None, "x"], "future": {"ignored": [1]}})
+    items = dict(_items(data, step))
+    assert items["names.names"] == ["a", "b"]
+    assert items["names.entries"] == [0, 1, 0]
+    assert items["names.weights"] == [1, 2.5, 3]
+    assert items["names.groups"] == ["x", None, "x"]
+    assert "names.future" not in items
+
+
+def test_unread_compact_arrays_are_skipped():
+    data = _config(names={"names": ["a", "b"], "weights": [1, 2]}, settings={})
+    keys = [key for key, _ in iter_config(io.BytesIO(data))]
+    assert keys == ["metadata", "names.names", "names.weights", "settings"]
+
+
+def test_compact_roster_round_trips(tmp_path):
+    roster = Roster(["a", "b", "a", "c"], [1, 2, 3, 1], ["red", None, "red", "blue"])
+    data = _config(names=roster.to_export(), settings={}, results=[])
+    imported = import_configuration(Trickle(data, 11), len(data), Ledger(str(tmp_path / "ledger.db")), "h", {})
+    assert imported["roster"].entries() == roster.entries()
+    assert imported["roster"].groups() == roster.groups()
+
+
+@pytest.mark.parametrize("data, message", [
+    (b'{"names": ["a" "b"]}', "expected , or ]"),
+    (b'{"names": ["a", "b"', "end of file"),
+    (b'{"names": {"names": ["a"], "weights": 3}}', "must be a list"),
+    (b'{"names": {"weights": [1]}}', "needs a 'names' list"),
+    (b'{"names": ["a"]} trailing', "unexpected data"),
+    (b'{1: "a"}', "malformed JSON"),
+    (b'{"names": ["a\xff"]}', "UTF-8"),
+])
+def test_malformed_input_is_rejected(data, message):
+    with pytest.raises(ConfigImportError, match=message):
+        _items(data, 3)
+
+
+@pytest.mark.parametrize("names, message", [
+    ({"names": ["a"], "entries": [0, 1]}, "index into the names list"),
+    ({"names": ["a"], "entries": [True]}, "index into the names list"),
+    ({"names": ["a", "b"], "weights": [1]}, "one weight per entry"),
+    ({"names": ["a"], "weights": [0]}, "positive"),
+    ({"names": ["a"], "weights": [float("inf")]}, "finite"),
+    ({"names": ["a"], "weights": [float("nan")]}, "finite"),
+    ({"names": ["a"], "groups": [1]}, "text or null"),
+    ({"names": [""]}, "non-empty"),
+])
+def test_invalid_compact_roster_is_rejected(tmp_path, names, message):
+    data = _config(names=names)
+    with pytest.raises(ConfigImportError, match=message):
+        import_configuration(io.BytesIO(data), len(data), Ledger(str(tmp_path / "ledger.db")), "h", {})
+
+
+@pytest.mark.parametrize("settings, message", [
+    ({"selection_mode": "weighted"}, "one of"),
+    ({"render_mode": "webgl"}, "one of"),
+    ({"recency_half_life": 0}, "between"),
+    ({"spin_duration": "4"}, "must be int"),
+])
+def test_out_of_range_settings_are_rejected(tmp_path, settings, message):
+    defaults = {"selection_mode": "random", "render_mode": "bitmap", "recency_half_life": 5, "spin_duration": 4}
+    data = _config(settings=settings)
+    with pytest.raises(ConfigImportError, match=message):
+        import_configuration(io.BytesIO(data), len(data), Ledger(str(tmp_path / "ledger.db")), "h", defaults)
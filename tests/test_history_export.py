@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+
+import pytest
+from streamlit.runtime.download_data_util import convert_data_to_bytes_and_infer_mime
+
+import history_export
+from history_export import FORMATS, export_bytes, export_file, export_metadata, export_route
+
+RESULTS = [
+    {"spin_number": 1, "timestamp": "2026-01-01T10:00:00", "winner": "Ann", "magic": False},
+    {"spin_number": 2, "timestamp": "2026-01-01T10:01:00", "winner": "Béla", "magic": True},
+    {"spin_number": 3, "timestamp": "2026-01-02T09:00:00", "winner": "Ann", "winners": ["Ann", "Çem"],
+     "magic": False},
+]
+
+
+@pytest.mark.parametrize("fmt", list(FORMATS))
+def test_in_app_download_converts_for_streamlit(fmt):
+    metadata = export_metadata("pro")
+    data = export_bytes(fmt, iter(RESULTS), metadata)
+    converted, _ = convert_data_to_bytes_and_infer_mime(data, RuntimeError("unsupported type"))
+    with export_file(fmt, iter(RESULTS), metadata) as spool:
+        assert converted == spool.read()
+
+
+def test_ndjson_carries_metadata_then_results():
+    lines = export_bytes("ndjson", iter(RESULTS), {"version": "3.0.0"}).decode("utf-8").splitlines()
+    assert json.loads(lines[0]) == {"metadata": {"version": "3.0.0"}}
+    assert [json.loads(line) for line in lines[1:]] == RESULTS
+
+
+def test_csv_joins_multi_winner_draws():
+    text = export_bytes("csv", iter(RESULTS), {"version": "3.0.0"}).decode("utf-8")
+    rows = list(csv.reader(line for line in io.StringIO(text) if not line.startswith("#")))
+    assert rows[0] == history_export.CSV_COLUMNS
+    assert rows[3][3] == "Ann; Çem"
+
+
+def test_parquet_round_trips():
+    pq = pytest.importorskip("pyarrow.parquet")
+    table = pq.read_table(io.BytesIO(export_bytes("parquet", iter(RESULTS), {"version": "3.0.0"})))
+    assert table.column("winner").to_pylist() == ["Ann", "Béla", "Ann"]
+    assert json.loads(table.schema.metadata[b"wheelmaster"]) == {"version": "3.0.0"}
+
+
+@pytest.mark.parametrize("base, path", [("", "/export/history"), ("raffle/", "/raffle/export/history")])
+def test_route_follows_base_url_path(monkeypatch, base, path):
+    from streamlit import config
+
+    monkeypatch.setattr(history_export, "ROUTE_PATH", None)
+    config.set_option("server.baseUrlPath", base)
+    try:
+        assert export_route().path == path
+    finally:
+        config.set_option("server.baseUrlPath", "")
+    assert history_export.ROUTE_PATH == path
@@ -0,0 +1,90 @@
+import io
+
+import pytest
+
+from roster import Roster, parse_entry
+from roster_import import RosterImportError, guess_mapping, load_roster, open_rows, read_header
+
+
+def _load(data, filename="roster.csv", **kwargs):
+    file = io.BytesIO(data)
+    header = read_header(file, filename)
+    rows = open_rows(file, filename)
+    next(rows)
+    roster, counts = load_roster(rows, guess_mapping(header), **kwargs)
+    return roster, counts
+
+
+@pytest.mark.parametrize("header, mapping", [
+    (["Name", "Tickets", "Team", "Active"], {"name": 0, "weight": 1, "group": 2, "active": 3}),
+    (["Email", "Department"], {"name": 0, "group": 1}),
+    (["ID", "Odds"], {"name": 0, "weight": 1}),
+    (["Entries"], {"name": 0}),
+    (["Team", "Entries"], {"name": 0, "weight": 1}),
+    ([" NAME ", "name"], {"name": 0}),
+])
+def test_mapping_is_guessed_from_titles(header, mapping):
+    assert guess_mapping(header) == mapping
+
+
+@pytest.mark.parametrize("data, filename", [
+    (b"Name,Tickets,Team\r\nAnn,2,red\r\nBob,,\r\n", "roster.csv"),
+    (b"\xef\xbb\xbfName;Tickets;Team\nAnn;2;red\nBob;;\n", "roster.csv"),
+    (b"Name\tTickets\tTeam\nAnn\t2\tred\nBob\t\t\n", "roster.tsv"),
+])
+def test_csv_dialects_load_the_same_roster(data, filename):
+    roster, counts = _load(data, filename)
+    assert roster.to_list() == ["Ann", "Bob"]
+    assert roster.weights() == [2.0, 1]
+    assert roster.groups() == ["red", None]
+    assert counts == {"added": 2, "duplicates": 0, "inactive": 0, "invalid": 0}
+
+
+def test_weights_must_be_positive_and_finite():
+    data = b"Name,Weight\nA,1.5\nB,0\nC,-2\nD,inf\nE,nan\nF,lots\nG,\n"
+    roster, counts = _load(data)
+    assert roster.to_list() == ["A", "G"]
+    assert roster.weights() == [1.5, 1]
+    assert counts["invalid"] == 5
+
+
+def test_inactive_duplicate_and_blank_rows_are_counted():
+    data = b"Name,Active\nA,yes\nB,no\nA,\n,\n\nC,0\n"
+    roster, counts = _load(data)
+    assert roster.to_list() == ["A"]
+    assert counts == {"added": 1, "duplicates": 1, "inactive": 2, "invalid": 0}
+    roster, counts = _load(data, roster=Roster(["A"]), allow_duplicates=True)
+    assert roster.to_list() == ["A", "A", "A"]
+
+
+@pytest.mark.parametrize("data, filename, message", [
+    (b"", "roster.csv", "empty"),
+    (b'Name\n"' + b"x" * 200_000 + b'"\n', "roster.csv", "not a readable CSV"),
+    (b"Name\nB\xe9la\n", "roster.csv", "UTF-8"),
+    (b"Name\nAnn\n", "roster.ods", "unsupported"),
+    (b"not a zip", "roster.xlsx", "xlsx"),
+], ids=["empty", "oversized-field", "not-utf8", "unsupported", "bad-xlsx"])
+def test_malformed_files_are_rejected(data, filename, message):
+    with pytest.raises(RosterImportError, match=message):
+        _load(data, filename)
+
+
+def test_xlsx_rows_are_streamed():
+    openpyxl = pytest.importorskip("openpyxl")
+    book = openpyxl.Workbook()
+    sheet = book.active
+    for row in (["Participant", "Chances", "Group", "Eligible"], ["Ann", 3, "red", "yes"],
+                ["Bob", None, None, "no"], [1234.0, 2.5, None, None], [None, None, None, None]):
+        sheet.append(row)
+    file = io.BytesIO()
+    book.save(file)
+    roster, counts = _load(file.getvalue(), "roster.xlsx")
+    assert roster.to_list() == ["Ann", "1234"]
+    assert roster.weights() == [3, 2.5]
+    assert roster.groups() == ["red", None]
+    assert counts == {"added": 2, "duplicates": 0, "inactive": 1, "invalid": 0}
+
+
+def test_pasted_weights_must_be_finite():
+    assert parse_entry("Ann | 2 | red") == ("Ann", 2.0, "red")
+    assert parse_entry("Ann | inf") == ("Ann | inf", 1, None)
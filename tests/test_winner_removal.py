@@ -0,0 +1,51 @@
+import uuid
+from collections import Counter
+from functools import partial
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+import ledger
+from roster import Roster
+
+WHEEL = str(Path(__file__).resolve().parent.parent / "Wheel.py")
+NAMES = ["A", "A", "A", "B", "B", "B", "C", "D"]
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    monkeypatch.setattr(ledger, "Ledger", partial(ledger.Ledger, str(tmp_path / "ledger.db")))
+    ledger.open_ledger.clear()
+    at = AppTest.from_file(WHEEL, default_timeout=60)
+    at.query_params["history"] = uuid.uuid4().hex
+    at.run()
+    at.session_state.names = Roster(NAMES)
+    at.session_state.wheel_settings = dict(at.session_state.wheel_settings, remove_winner=True,
+                                           allow_duplicates=False)
+    return at.run()
+
+
+def _winners(at):
+    return [result["winner"] for result in ledger.open_ledger().results(at.session_state.history_id)]
+
+
+def _check_removed(at, spins):
+    winners = _winners(at)
+    assert not at.exception
+    assert len(winners) == len(set(winners)) == spins
+    assert Counter(at.session_state.names.to_list()) == Counter(name for name in NAMES if name not in winners)
+
+
+@pytest.mark.parametrize("spins", [1, 2, 3])
+def test_batch_removes_every_entry_of_its_winners(app, spins):
+    app.number_input(key="batch_count").set_value(spins).run()
+    app.button(key="run_batch").click().run()
+    _check_removed(app, spins)
+
+
+@pytest.mark.parametrize("spins", [1, 2, 3])
+def test_single_spins_remove_every_entry_of_their_winners(app, spins):
+    for _ in range(spins):
+        app.button(key="instant_spin").click().run()
+    _check_removed(app, spins)
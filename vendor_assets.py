@@ -0,0 +1,70 @@
+"""Bundle GSAP, Winwheel and the app fonts for offline serving.
+
+Run once on a machine with network access, e.g. while building the kiosk
+image, and ship the resulting static/vendor/ directory with the app:
+
+    python vendor_assets.py
+
+Every file is written with a content-hashed name plus .gz/.br variants
+(brotli variants need the optional ``brotli`` package), and
+static/vendor/manifest.json maps ``gsap``, ``winwheel`` and ``fonts`` to
+them. assets.vendor_urls() picks the manifest up on the next start.
+
+This is a required build step: server.py refuses to start without the
+bundle unless WHEEL_ALLOW_CDN=1 lets the browser fetch the upstream copies.
+"""
+import json
+import os
+import re
+import urllib.request
+
+from assets import VENDOR_DIR, VENDOR_SOURCES, hashed_name, write_precompressed
+
+# Google Fonts only serves woff2 faces to browsers it recognises
+BROWSER_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+)
+FONT_URL_PATTERN = re.compile(r"url\((https://fonts\.gstatic\.com/[^)]+)\)")
+
+
+def fetch(url):
+    """Download a URL and return its body"""
+    request = urllib.request.Request(url, headers={"User-Agent": BROWSER_USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.read()
+
+
+def vendor(filename, data):
+    """Store one asset under its hashed name and return that name"""
+    name = hashed_name(filename, data)
+    write_precompressed(os.path.join(VENDOR_DIR, name), data)
+    print(f"  {name} ({len(data):,} bytes)")
+    return name
+
+
+def vendor_fonts():
+    """Bundle the font faces and a stylesheet that points at the local copies"""
+    css = fetch(VENDOR_SOURCES["fonts"]).decode("utf-8")
+    local_names = {}
+    for url in sorted(set(FONT_URL_PATTERN.findall(css))):
+        local_names[url] = vendor(os.path.basename(url), fetch(url))
+
+    css = FONT_URL_PATTERN.sub(lambda match: f"url({local_names[match.group(1)]})", css)
+    return vendor("fonts.css", css.encode("utf-8"))
+
+
+def main():
+    print(f"Vendoring assets into {VENDOR_DIR}")
+    manifest = {
+        "gsap": vendor("gsap.min.js", fetch(VENDOR_SOURCES["gsap"])),
+        "winwheel": vendor("Winwheel.min.js", fetch(VENDOR_SOURCES["winwheel"])),
+        "fonts": vendor_fonts(),
+    }
+    with open(os.path.join(VENDOR_DIR, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    print("Done. Restart the app to serve the bundled copies.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import json
+import os
+
+import streamlit.components.v1 as components
+
+# The wheel markup, CSS and JS are static files served once by Streamlit's
+# component route. Reruns only post the wheel state below to the
+# already-mounted iframe, so sliders and buttons no longer reload it.
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+_premium_wheel = components.declare_component("premium_wheel", path=_FRONTEND_DIR)
+
+
+def premium_wheel(segments, settings, wheel_size, magic_mode, spin, replay,
+                  spin_number, assets, key="premium_wheel", on_change=None):
+    """Render the persistent premium wheel and return the last landed segment
+
+    ``spin`` is the ``{index, stopAngle, winner, magic}`` outcome armed by the spin engine;
+    the wheel animates to it when clicked. ``replay`` is the last outcome
+    committed without animation, shown on the wheel as-is. ``assets`` maps
+    ``gsap``, ``winwheel`` and ``fonts`` to their URLs (see assets.vendor_urls);
+    the iframe loads them once, on its first render.
+
+    ``settings["render_mode"]`` is ``"bitmap"`` (drawn once, spun as an image)
+    or ``"canvas"`` (redrawn every frame).
+
+    The return value is ``None`` until the first spin finishes, then a dict
+    with ``index``, ``winner``, ``spin_number`` and ``timestamp`` for the
+    segment the wheel stopped on. ``on_change`` fires once per new spin.
+    """
+    # A fixed key keeps the component identity stable while its args change;
+    # without it Streamlit would treat every new roster as a new iframe.
+    # The state travels as one JSON string: Streamlit probes list and dict
+    # args for dataframe-likeness, which imports pandas on every rerun.
+    state = {
+        "segments": segments,
+        "settings": settings,
+        "wheel_size": wheel_size,
+        "magic_mode": magic_mode,
+        "spin": spin,
+        "replay": replay,
+        "spin_number": spin_number,
+        "assets": assets,
+    }
+    return _premium_wheel(
+        state=json.dumps(state),
+        key=key,
+        on_change=on_change,
+        default=None,
+    )
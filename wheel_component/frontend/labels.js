@@ -0,0 +1,156 @@
+// Level-of-detail labels. Past a few hundred entries there is no room on the
+// wheel for every name, so each slice's label is drawn in full, abbreviated or
+// skipped depending on the room the slice has at the current wheel size.
+// Slices too thin to show a stroke lose that too. Wheels whose labels had to
+// be reduced get a strip above the pointer naming the slices passing under it.
+//
+// Text widths come from canvas measureText, taken once per name and font at a
+// reference size and scaled, since a label's width grows linearly with it.
+
+const LABEL_MIN_FONT = 9;
+const LABEL_LINE_HEIGHT = 1.15;
+const LABEL_MIN_CHARS = 3;
+const STROKE_MIN_ARC = 6;
+const MEASURE_SIZE = 100;
+const STRIP_NEIGHBOURS = 2;
+
+const measureContext = document.createElement('canvas').getContext('2d');
+const measureCache = new Map();
+
+// Width of ``text`` per pixel of font size
+function unitWidth(text, geometry) {
+    const key = geometry.fontWeight + ' ' + geometry.fontFamily + '\n' + text;
+    let width = measureCache.get(key);
+    if (width === undefined) {
+        measureContext.font = geometry.fontWeight + ' ' + MEASURE_SIZE + 'px ' + geometry.fontFamily;
+        width = measureContext.measureText(text).width / MEASURE_SIZE;
+        measureCache.set(key, width);
+    }
+    return width;
+}
+
+// Widths measured before a webfont arrived belong to the fallback font
+function clearMeasurements() {
+    measureCache.clear();
+}
+
+// Largest font, up to the base size, at which ``lines`` fit in a slice whose
+// chord is ``spread`` times the radius
+function fitFont(lines, spread, geometry) {
+    const unit = Math.max(...lines.map(line => unitWidth(line, geometry)));
+    const mid = (geometry.outerRadius + geometry.innerRadius) / 2;
+    const room = geometry.outerRadius - geometry.innerRadius - 2 * geometry.textMargin;
+    // Labels are centred on the mid radius, so their inner end sits where the slice is narrowest
+    const across = spread * mid / (lines.length * LABEL_LINE_HEIGHT + spread * unit / 2);
+    return Math.min(geometry.fontSize, room / unit, across);
+}
+
+// ``{text, size}`` for the most of the label that fits, or null to skip it
+function fitLabel(segment, spread, geometry) {
+    // Not even one line of the smallest font fits across the outer edge
+    if (spread * geometry.outerRadius < LABEL_MIN_FONT * LABEL_LINE_HEIGHT) {
+        return null;
+    }
+    const candidates = segment.odds ? [[segment.text, segment.odds], [segment.text]] : [[segment.text]];
+    for (const lines of candidates) {
+        const size = fitFont(lines, spread, geometry);
+        if (size >= LABEL_MIN_FONT) {
+            return { text: lines.join('\n'), size: Math.floor(size) };
+        }
+    }
+
+    // Longest prefix that still fits at the smallest font, found by bisection
+    const chars = Array.from(segment.text);
+    let low = LABEL_MIN_CHARS;
+    let high = chars.length - 1;
+    let best = null;
+    while (low <= high) {
+        const length = (low + high) >> 1;
+        const text = chars.slice(0, length).join('') + '…';
+        const size = fitFont([text], spread, geometry);
+        if (size >= LABEL_MIN_FONT) {
+            best = { text: text, size: Math.floor(size) };
+            low = length + 1;
+        } else {
+            high = length - 1;
+        }
+    }
+    return best;
+}
+
+// Winwheel segments with their labels fitted to ``geometry``; ``reduced`` is
+// true when any label was shortened or skipped
+function layoutLabels(segments, geometry) {
+    let reduced = false;
+    const laidOut = segments.map(segment => {
+        const angle = segment.size || 360 / segments.length;
+        const spread = 2 * Math.sin(Math.min(angle, 180) * Math.PI / 360);
+        const label = fitLabel(segment, spread, geometry);
+        const fitted = Object.assign({}, segment, {
+            'text': label ? label.text : '',
+            'textFontSize': label ? label.size : geometry.fontSize
+        });
+        if (!label || label.text !== (segment.odds ? segment.text + '\n' + segment.odds : segment.text)) {
+            reduced = true;
+        }
+        // Winwheel skips the stroke for an empty style
+        if (spread * geometry.outerRadius < STROKE_MIN_ARC) {
+            fitted.strokeStyle = '';
+        }
+        return fitted;
+    });
+    return { segments: laidOut, reduced: reduced };
+}
+
+// Pointer strip: slice start angles (clockwise from the top) and names
+let stripStarts = [];
+let stripNames = [];
+let stripIndex = -1;
+
+function setStripSegments(segments, shown) {
+    const strip = document.getElementById('labelStrip');
+    strip.hidden = !shown;
+    stripIndex = -1;
+    stripStarts = [];
+    stripNames = shown ? segments.map(segment => segment.text) : [];
+    let start = 0;
+    for (const segment of shown ? segments : []) {
+        stripStarts.push(start);
+        start += segment.size || 360 / segments.length;
+    }
+}
+
+// Show the slices around the pointer for a wheel turned ``rotation`` degrees clockwise
+function updateStrip(rotation) {
+    if (!stripNames.length) {
+        return;
+    }
+    // The pointer is at the top, over the wheel angle the rotation brought there
+    const angle = ((-rotation % 360) + 360) % 360;
+    let low = 0;
+    let high = stripStarts.length - 1;
+    while (low < high) {
+        const middle = (low + high + 1) >> 1;
+        if (stripStarts[middle] <= angle) {
+            low = middle;
+        } else {
+            high = middle - 1;
+        }
+    }
+    if (low === stripIndex) {
+        return;
+    }
+    stripIndex = low;
+
+    const count = stripNames.length;
+    const spans = [];
+    for (let offset = -STRIP_NEIGHBOURS; offset <= STRIP_NEIGHBOURS; offset++) {
+        const span = document.createElement('span');
+        span.textContent = stripNames[(((low + offset) % count) + count) % count];
+        if (offset === 0) {
+            span.className = 'current';
+        }
+        spans.push(span);
+    }
+    document.getElementById('labelStrip').replaceChildren(...spans);
+}
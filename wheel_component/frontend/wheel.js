@@ -0,0 +1,433 @@
+// Streamlit component bridge. The iframe is mounted once; every rerun only
+// posts a "streamlit:render" message carrying the latest wheel state.
+const Streamlit = {
+    send(type, data) {
+        window.parent.postMessage(Object.assign({ isStreamlitMessage: true, type: type }, data), '*');
+    },
+    setComponentReady() {
+        this.send('streamlit:componentReady', { apiVersion: 1 });
+    },
+    setFrameHeight(height) {
+        this.send('streamlit:setFrameHeight', { height: height });
+    },
+    setComponentValue(value) {
+        this.send('streamlit:setComponentValue', { value: value, dataType: 'json' });
+    }
+};
+
+let state = null;
+let wheel = null;
+let wheelSignature = '';
+let frameHeight = 0;
+let spinning = false;
+let activeSpin = null;
+let lastReplayId;
+let assetsLoaded = null;
+let labelsReduced = false;
+
+// Both render modes share Winwheel's spinToStop easing
+const SPIN_EASING = 'Power3.easeOut';
+
+window.addEventListener('message', (event) => {
+    if (event.data && event.data.type === 'streamlit:render') {
+        const args = JSON.parse(event.data.args.state);
+        loadAssets(args.assets).then(() => applyState(args)).catch(showLoadError);
+    }
+});
+
+// Without GSAP or Winwheel there is no wheel to draw: say so instead of staying blank
+function showLoadError(error) {
+    const message = document.getElementById('loadError');
+    message.textContent = '⚠️ The wheel could not be loaded (' + error.message + '). '
+        + 'If this device is offline, the app needs its bundled assets: run vendor_assets.py when building it.';
+    message.hidden = false;
+    document.getElementById('spinBtn').disabled = true;
+    Streamlit.setFrameHeight(document.body.scrollHeight);
+}
+
+// GSAP, Winwheel and the fonts are fetched once per mounted iframe. Bundled
+// copies come as app-relative "app/static/..." paths; this page is served from
+// <base>/component/<name>/index.html, so they resolve against ../../.
+function loadAssets(assets) {
+    if (!assetsLoaded) {
+        const appRoot = new URL('../../', window.location.href);
+        const fonts = document.createElement('link');
+        fonts.rel = 'stylesheet';
+        fonts.href = new URL(assets.fonts, appRoot).href;
+        document.head.appendChild(fonts);
+
+        assetsLoaded = loadScript(new URL(assets.gsap, appRoot).href)
+            .then(() => loadScript(new URL(assets.winwheel, appRoot).href));
+    }
+    return assetsLoaded;
+}
+
+function loadScript(src) {
+    return new Promise((resolve, reject) => {
+        const script = document.createElement('script');
+        script.src = src;
+        script.onload = resolve;
+        script.onerror = () => reject(new Error('Failed to load ' + src));
+        document.head.appendChild(script);
+    });
+}
+
+function applyState(args) {
+    state = args;
+    const settings = state.settings;
+
+    document.documentElement.style.setProperty('--wheel-size', state.wheel_size + 'px');
+    document.getElementById('statParticipants').textContent = state.segments.length;
+    document.getElementById('statDuration').textContent = settings.spin_duration + 's';
+    document.getElementById('statIntensity').textContent = settings.spin_count + 'x';
+    document.getElementById('statMagic').hidden = !state.magic_mode;
+    document.getElementById('magicIndicator').hidden = !state.magic_mode;
+
+    const btn = document.getElementById('spinBtn');
+    btn.classList.toggle('magic-button', state.magic_mode);
+    if (!spinning) {
+        btn.innerHTML = state.magic_mode ? '🎩 Magic Spin' : '🎯 Spin the Wheel';
+    }
+
+    // Only redraw the canvas when the roster, colours, size or render mode actually
+    // changed; a wheel in mid-spin picks the new geometry up once it has stopped.
+    const signature = JSON.stringify([state.segments, state.wheel_size, settings.render_mode]);
+    if (signature !== wheelSignature && !spinning) {
+        buildWheel();
+        wheelSignature = signature;
+    }
+    if (wheel) {
+        wheel.animation.duration = settings.spin_duration;
+        wheel.animation.spins = settings.spin_count;
+    }
+
+    // Outcomes committed server-side without animation: show them as landed.
+    // The first render after mounting only records the id so nothing replays twice.
+    const replayId = state.replay ? state.replay.id : null;
+    if (lastReplayId !== undefined && replayId !== lastReplayId) {
+        showReplay(state.replay);
+    }
+    lastReplayId = replayId;
+
+    const height = state.wheel_size + 500 + (labelsReduced ? 60 : 0);
+    if (height !== frameHeight) {
+        frameHeight = height;
+        Streamlit.setFrameHeight(height);
+    }
+}
+
+// In bitmap mode the wheel is drawn once, at rest, and a spin only rotates the
+// canvas element with a CSS transform. The browser turns the already-painted
+// layer on the GPU instead of Winwheel redrawing every segment, label and
+// stroke each frame, which keeps large wheels at the display's frame rate.
+function bitmapMode() {
+    return state.settings.render_mode === 'bitmap';
+}
+
+function buildWheel() {
+    const size = state.wheel_size;
+    const canvas = document.getElementById('canvas');
+    canvas.width = size;
+    canvas.height = size;
+    gsap.killTweensOf(canvas);
+    gsap.set(canvas, { rotation: 0 });
+
+    const geometry = {
+        outerRadius: Math.floor(size / 2) - 15,
+        innerRadius: 40,
+        fontSize: Math.max(12, Math.min(18, Math.floor(size / 25))),
+        fontFamily: 'Inter',
+        fontWeight: '600',
+        textMargin: 15
+    };
+    // A segment's odds, when they fit, are drawn as a second line under its name
+    const labels = layoutLabels(state.segments, geometry);
+    labelsReduced = labels.reduced;
+    setStripSegments(state.segments, labelsReduced);
+
+    wheel = new Winwheel({
+        'canvasId': 'canvas',
+        'numSegments': state.segments.length,
+        'outerRadius': geometry.outerRadius,
+        'innerRadius': geometry.innerRadius,
+        'segments': labels.segments,
+        'textFontSize': geometry.fontSize,
+        'textFontFamily': geometry.fontFamily,
+        'textFontWeight': geometry.fontWeight,
+        'textAlignment': 'center',
+        'textDirection': 'reversed',
+        'textMargin': geometry.textMargin,
+        'strokeStyle': '#ffffff',
+        'lineWidth': 3,
+        'animation': {
+            'type': 'spinToStop',
+            'duration': state.settings.spin_duration,
+            'spins': state.settings.spin_count,
+            'easing': SPIN_EASING,
+            'callbackFinished': displayWinner,
+            'callbackAfter': resetSpinButton
+        }
+    });
+    updateStrip(0);
+}
+
+// Redraw the labels once the wheel's webfont has loaded, keeping the wheel where it stands
+document.fonts.addEventListener('loadingdone', (event) => {
+    const wheelFont = event.fontfaces.some(face => face.family.replace(/["']/g, '') === 'Inter');
+    if (wheelFont && wheel && !spinning) {
+        clearMeasurements();
+        const angle = currentRotation();
+        buildWheel();
+        parkWheel(angle);
+        applyState(state);
+    }
+});
+
+function currentRotation() {
+    if (bitmapMode()) {
+        return gsap.getProperty(document.getElementById('canvas'), 'rotation');
+    }
+    return wheel.rotationAngle;
+}
+
+// Keep the pointer strip on the slice under the pointer while the wheel turns
+function followPointer() {
+    updateStrip(currentRotation());
+    if (spinning) {
+        requestAnimationFrame(followPointer);
+    }
+}
+
+function resetSpinButton() {
+    document.getElementById('spinBtn').disabled = false;
+    document.getElementById('spinBtn').innerHTML = state.magic_mode ? '🎩 Magic Spin' : '🎯 Spin Again';
+}
+
+// Same end angle as Winwheel's spinToStop: the full turns, then the stop angle
+// brought under the pointer at the top
+function spinBitmap(stopAngle) {
+    const canvas = document.getElementById('canvas');
+    const target = state.settings.spin_count * 360 + 360 - stopAngle;
+    gsap.killTweensOf(canvas);
+    gsap.set(canvas, { rotation: 0 });
+    canvas.classList.add('gpu-spin');
+    gsap.to(canvas, {
+        rotation: target,
+        duration: state.settings.spin_duration,
+        ease: SPIN_EASING,
+        force3D: true,
+        onComplete: () => {
+            canvas.classList.remove('gpu-spin');
+            gsap.set(canvas, { rotation: target % 360 });
+            resetSpinButton();
+            displayWinner();
+        }
+    });
+}
+
+// Turn the resting wheel to ``angle`` without animating
+function parkWheel(angle) {
+    if (bitmapMode()) {
+        gsap.set(document.getElementById('canvas'), { rotation: angle });
+    } else {
+        wheel.rotationAngle = angle;
+        wheel.draw();
+    }
+    updateStrip(angle);
+}
+
+function startSpin() {
+    if (!wheel) {
+        return;
+    }
+
+    // The outcome was already drawn by the Python spin engine; only animate to it
+    activeSpin = Object.assign({ spin_number: state.spin_number }, state.spin);
+    const magicMode = activeSpin.magic;
+
+    console.log('Starting premium spin #' + activeSpin.spin_number);
+    const btn = document.getElementById('spinBtn');
+    btn.disabled = true;
+    btn.innerHTML = '🌀 Spinning...';
+    spinning = true;
+
+    // Reset winner display
+    const winnerEl = document.getElementById("winner");
+    winnerEl.innerHTML = "";
+    winnerEl.className = "";
+
+    wheel.stopAnimation(false);
+
+    if (magicMode) {
+        // Magic visual effects
+        document.querySelector('.wheel-glow').style.animation = 'wheel-glow 1s linear infinite';
+        document.getElementById('pointer').style.filter = 'drop-shadow(0px 6px 12px rgba(124, 58, 237, 0.8))';
+    } else {
+        document.querySelector('.wheel-glow').style.animation = 'wheel-glow 4s linear infinite';
+        document.getElementById('pointer').style.filter = 'drop-shadow(0px 6px 12px rgba(102, 126, 234, 0.6))';
+    }
+
+    if (bitmapMode()) {
+        spinBitmap(activeSpin.stopAngle);
+    } else {
+        wheel.rotationAngle = 0;
+        wheel.animation.stopAngle = activeSpin.stopAngle;
+        wheel.startAnimation();
+    }
+    if (labelsReduced) {
+        requestAnimationFrame(followPointer);
+    }
+
+    // Premium audio experience
+    if (state.settings.sound_enabled) {
+        playPremiumSpinSound(magicMode);
+    }
+}
+
+function displayWinner() {
+    spinning = false;
+    showWinner(activeSpin.winner, activeSpin.magic);
+
+    // Hand the landed segment straight back to Python as the component value
+    Streamlit.setComponentValue({
+        index: activeSpin.index,
+        winner: activeSpin.winner,
+        timestamp: new Date().toISOString(),
+        spin_number: activeSpin.spin_number
+    });
+
+    // Celebration sound
+    if (state.settings.sound_enabled) {
+        playWinnerSound(activeSpin.magic);
+    }
+
+    // Apply any roster/theme update that arrived while the wheel was spinning
+    applyState(state);
+}
+
+function showReplay(replay) {
+    if (!replay || spinning) {
+        return;
+    }
+    // Park the wheel on the committed angle when that segment is still drawn
+    const segment = state.segments[replay.index];
+    if (segment && segment.text === replay.winner) {
+        wheel.stopAnimation(false);
+        parkWheel(360 - replay.stopAngle);
+    }
+    showWinner(replay.winner, replay.magic);
+}
+
+function showWinner(winner, isMagic) {
+    const winnerElement = document.getElementById("winner");
+
+    if (isMagic) {
+        winnerElement.innerHTML = "🎩✨ " + winner + " ✨🎩";
+        winnerElement.className = "magic-winner";
+
+        // Magic celebration effects
+        setTimeout(() => {
+            createMagicParticles();
+        }, 100);
+    } else {
+        winnerElement.innerHTML = "🏆 " + winner + " 🏆";
+        winnerElement.className = "";
+    }
+
+    console.log('🎉 Winner: ' + winner + (isMagic ? ' (Magic!)' : ' (Random)'));
+}
+
+function playPremiumSpinSound(isMagic = false) {
+    const audioContext = new (window.AudioContext || window.webkitAudioContext)();
+    const oscillator = audioContext.createOscillator();
+    const gainNode = audioContext.createGain();
+
+    oscillator.connect(gainNode);
+    gainNode.connect(audioContext.destination);
+
+    if (isMagic) {
+        // Magical ethereal sound
+        oscillator.frequency.setValueAtTime(1400, audioContext.currentTime);
+        oscillator.frequency.exponentialRampToValueAtTime(800, audioContext.currentTime + 0.4);
+        oscillator.frequency.exponentialRampToValueAtTime(1200, audioContext.currentTime + 0.8);
+        oscillator.type = 'sine';
+    } else {
+        // Professional spin sound
+        oscillator.frequency.setValueAtTime(1000, audioContext.currentTime);
+        oscillator.frequency.exponentialRampToValueAtTime(300, audioContext.currentTime + 0.6);
+        oscillator.type = 'triangle';
+    }
+
+    gainNode.gain.setValueAtTime(0.2, audioContext.currentTime);
+    gainNode.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.8);
+
+    oscillator.start(audioContext.currentTime);
+    oscillator.stop(audioContext.currentTime + 0.8);
+}
+
+function playWinnerSound(isMagic = false) {
+    setTimeout(() => {
+        const audioContext = new (window.AudioContext || window.webkitAudioContext)();
+
+        if (isMagic) {
+            // Magic winner chimes
+            [1200, 1400, 1600].forEach((freq, i) => {
+                setTimeout(() => {
+                    const osc = audioContext.createOscillator();
+                    const gain = audioContext.createGain();
+
+                    osc.connect(gain);
+                    gain.connect(audioContext.destination);
+
+                    osc.frequency.value = freq;
+                    osc.type = 'sine';
+                    gain.gain.setValueAtTime(0.3, audioContext.currentTime);
+                    gain.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.5);
+
+                    osc.start();
+                    osc.stop(audioContext.currentTime + 0.5);
+                }, i * 150);
+            });
+        } else {
+            // Standard celebration
+            const osc = audioContext.createOscillator();
+            const gain = audioContext.createGain();
+
+            osc.connect(gain);
+            gain.connect(audioContext.destination);
+
+            osc.frequency.setValueAtTime(800, audioContext.currentTime);
+            osc.frequency.exponentialRampToValueAtTime(1200, audioContext.currentTime + 0.3);
+            osc.type = 'square';
+            gain.gain.setValueAtTime(0.2, audioContext.currentTime);
+            gain.gain.exponentialRampToValueAtTime(0.01, audioContext.currentTime + 0.4);
+
+            osc.start();
+            osc.stop(audioContext.currentTime + 0.4);
+        }
+    }, 500);
+}
+
+function createMagicParticles() {
+    // Create magical particle effect for magic wins
+    for (let i = 0; i < 20; i++) {
+        const particle = document.createElement('div');
+        particle.innerHTML = '✨';
+        particle.style.position = 'absolute';
+        particle.style.fontSize = Math.random() * 20 + 10 + 'px';
+        particle.style.color = ['#a78bfa', '#c084fc', '#e879f9'][Math.floor(Math.random() * 3)];
+        particle.style.left = Math.random() * window.innerWidth + 'px';
+        particle.style.top = Math.random() * window.innerHeight + 'px';
+        particle.style.pointerEvents = 'none';
+        particle.style.zIndex = '1000';
+        particle.style.animation = 'float 2s ease-out forwards';
+
+        document.body.appendChild(particle);
+
+        setTimeout(() => {
+            particle.remove();
+        }, 2000);
+    }
+}
+
+Streamlit.setComponentReady();